@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+from elo import expected_score
+from teams import CONFERENCES
+
+TEAM_CONFERENCE = {team: conf for conf, teams in CONFERENCES.items() for team in teams}
+
+def game_frame(rated_games):
+    # One row per played game with both teams' pre-game ratings
+    columns = {'date': [], 'home': [], 'away': [], 'home_pts': [], 'away_pts': [], 'home_elo': [], 'away_elo': []}
+    for rated in rated_games:
+        columns['date'].append(rated.game.date)
+        columns['home'].append(rated.game.home)
+        columns['away'].append(rated.game.away)
+        columns['home_pts'].append(rated.game.home_pts)
+        columns['away_pts'].append(rated.game.away_pts)
+        columns['home_elo'].append(rated.home_before)
+        columns['away_elo'].append(rated.away_before)
+    return pd.DataFrame(columns)
+
+def team_games(games):
+    # Stacks every game twice, once from each team's point of view, so that
+    # all per-team numbers are a single groupby over the result
+    home = pd.DataFrame({
+        'team': games['home'].to_numpy(),
+        'opponent': games['away'].to_numpy(),
+        'elo': games['home_elo'].to_numpy(),
+        'opp_elo': games['away_elo'].to_numpy(),
+        'win': (games['home_pts'] > games['away_pts']).to_numpy(dtype=float)
+    })
+    away = pd.DataFrame({
+        'team': games['away'].to_numpy(),
+        'opponent': games['home'].to_numpy(),
+        'elo': games['away_elo'].to_numpy(),
+        'opp_elo': games['home_elo'].to_numpy(),
+        'win': (games['away_pts'] > games['home_pts']).to_numpy(dtype=float)
+    })
+    stacked = pd.concat((home, away), ignore_index=True)
+    stacked['expected'] = expected_score(stacked['elo'].to_numpy(), stacked['opp_elo'].to_numpy())
+    stacked['conference'] = stacked['team'].map(TEAM_CONFERENCE)
+    stacked['intra'] = stacked['conference'].to_numpy() == stacked['opponent'].map(TEAM_CONFERENCE).to_numpy()
+    return stacked
+
+def team_summary(games, unplayed, current_elos):
+    # games: output of game_frame; unplayed: iterable of Game records still to be played
+    stacked = team_games(games)
+    grouped = stacked.groupby('team')
+
+    summary = pd.DataFrame({
+        'games': grouped.size(),
+        'wins': grouped['win'].sum().astype(int),
+        'expected_wins': grouped['expected'].sum(),
+        'sos': grouped['opp_elo'].mean()
+    })
+    summary['losses'] = summary['games'] - summary['wins']
+    summary['wins_over_expected'] = summary['wins'] - summary['expected_wins']
+
+    # Intra- vs cross-conference records
+    wins = stacked.pivot_table(index='team', columns='intra', values='win', aggfunc='sum', fill_value=0)
+    played = stacked.pivot_table(index='team', columns='intra', values='win', aggfunc='size', fill_value=0)
+    wins = wins.reindex(index=summary.index, columns=[True, False], fill_value=0)
+    played = played.reindex(index=summary.index, columns=[True, False], fill_value=0)
+    summary['intra_wins'] = wins[True].astype(int)
+    summary['intra_losses'] = (played[True] - wins[True]).astype(int)
+    summary['cross_wins'] = wins[False].astype(int)
+    summary['cross_losses'] = (played[False] - wins[False]).astype(int)
+
+    # Remaining strength of schedule, rated against current Elo
+    unplayed = pd.DataFrame(list(unplayed), columns=['date', 'away', 'away_pts', 'home', 'home_pts'])
+    if len(unplayed):
+        teams = np.concatenate((unplayed['home'].to_numpy(), unplayed['away'].to_numpy()))
+        opponents = np.concatenate((unplayed['away'].to_numpy(), unplayed['home'].to_numpy()))
+        remaining = pd.Series(pd.Series(opponents).map(current_elos).to_numpy(), index=teams)
+        summary['remaining_sos'] = remaining.groupby(level=0).mean()
+        summary['remaining_games'] = remaining.groupby(level=0).size()
+    else:
+        summary['remaining_sos'] = np.nan
+        summary['remaining_games'] = 0
+    summary['remaining_games'] = summary['remaining_games'].fillna(0).astype(int)
+
+    summary['conference'] = summary.index.map(TEAM_CONFERENCE)
+    return summary.sort_values('sos', ascending=False)
+
+def conference_summary(games):
+    # Cross-conference head to head and average pre-game rating per conference
+    stacked = team_games(games)
+    cross = stacked[~stacked['intra']]
+    grouped = cross.groupby('conference')
+    return pd.DataFrame({
+        'cross_wins': grouped['win'].sum().astype(int),
+        'cross_games': grouped.size(),
+        'cross_expected_wins': grouped['expected'].sum(),
+        'mean_elo': stacked.groupby('conference')['elo'].mean()
+    })
@@ -2,9 +2,18 @@ import streamlit as st
 import requests
 import pandas as pd
 import time
-import pickle
+import json
 from datetime import datetime
-import plotly.graph_objects as go
+
+from pipeline import games_from_csv, unplayed_games_from_csv, history_sink, rd_sink, run_pipeline
+from elo import rate_games
+from glicko import GlickoEngine
+from analytics import game_frame, team_summary, conference_summary
+from live import SNAPSHOT_MAX_AGE, snapshot_path
+from scenarios import SeasonReplay
+from plots import elo_bar_plot, elo_line_plot, elo_delta_plot, sos_bar_plot
+from export import ratings_data, export_tables
+from leagues import LeagueHost
 
 # Set page config
 st.set_page_config(layout="wide", page_title="NBA Elo Ratings")
@@ -21,335 +30,108 @@ st.write("A team gains points for winning and loses points for losing (duh). The
 st.header("Why does this matter?")
 st.markdown("This project was built as a way to settle arguments among my friends about which teams are actually the best - specifically, whether the top teams in the East are overrated since they play more games in the - let's be honest, much weaker - Eastern Conference. By tracking a metric that accounts for strength of opponents, we can get a more holistic view of which teams are the toughest to beat.")
 st.markdown("As a note - this is the second year I've been tracking this data. Last year I seeded each team initially at 1500 Elo, and this year each team picked up right where they left off. The performance of NBA teams is much more volatile than elite chess players due to trades and injuries, so it's useful to have more informed starting values.")
-# Constants 
-
-CONFERENCES = {
-    'Eastern': [
-        'Atlanta Hawks', 'Boston Celtics', 'Brooklyn Nets', 'Charlotte Hornets',
-        'Chicago Bulls', 'Cleveland Cavaliers', 'Detroit Pistons', 'Indiana Pacers',
-        'Miami Heat', 'Milwaukee Bucks', 'New York Knicks', 'Orlando Magic',
-        'Philadelphia 76ers', 'Toronto Raptors', 'Washington Wizards'
-    ],
-    'Western': [
-        'Dallas Mavericks', 'Denver Nuggets', 'Golden State Warriors', 'Houston Rockets',
-        'Los Angeles Clippers', 'Los Angeles Lakers', 'Memphis Grizzlies', 
-        'Minnesota Timberwolves', 'New Orleans Pelicans', 'Oklahoma City Thunder',
-        'Phoenix Suns', 'Portland Trail Blazers', 'Sacramento Kings', 
-        'San Antonio Spurs', 'Utah Jazz'
-    ]
-}
-
-TEAM_COLORS = {
-    'Los Angeles Lakers': 'rgb(85,37,130)',
-    'Phoenix Suns': 'rgb(29,17,96)',
-    'Houston Rockets': 'rgb(206,17,65)',
-    'Boston Celtics': 'rgb(0,122,51)',
-    'Washington Wizards': 'rgb(0,43,92)',
-    'Atlanta Hawks': 'rgb(200,16,46)',
-    'Detroit Pistons': 'rgb(200,16,46)',
-    'Minnesota Timberwolves': 'rgb(12,35,64)',
-    'Cleveland Cavaliers': 'rgb(134,0,56)',
-    'New Orleans Pelicans': 'rgb(0,22,65)',
-    'Oklahoma City Thunder': 'rgb(0,125,195)',
-    'Sacramento Kings': 'rgb(91,43,130)',
-    'Dallas Mavericks': 'rgb(0,83,188)',
-    'Portland Trail Blazers': 'rgb(224,58,62)',
-    'Philadelphia 76ers': 'rgb(0,107,182)',
-    'Denver Nuggets': 'rgb(13,34,64)',
-    'New York Knicks': 'rgb(0,107,182)',
-    'Miami Heat': 'rgb(152,0,46)',
-    'Toronto Raptors': 'rgb(206,17,65)',
-    'Brooklyn Nets': 'rgb(0,0,0)',
-    'Los Angeles Clippers': 'rgb(200,16,46)',
-    'Orlando Magic': 'rgb(0,125,197)',
-    'Golden State Warriors': 'rgb(255,199,44)',
-    'Chicago Bulls': 'rgb(206,17,65)',
-    'Memphis Grizzlies': 'rgb(93,118,169)',
-    'Indiana Pacers': 'rgb(0,45,98)',
-    'Utah Jazz': 'rgb(0,43,92)',
-    'San Antonio Spurs': 'rgb(196,206,211)',
-    'Milwaukee Bucks': 'rgb(0,71,27)',
-    'Charlotte Hornets': 'rgb(0,120,140)'
-}
-
-TEAM_ABBRS = {
-    'Los Angeles Lakers': 'LAL',
-    'Phoenix Suns': 'PHX',
-    'Houston Rockets': 'HOU',
-    'Boston Celtics': 'BOS',
-    'Washington Wizards': 'WAS',
-    'Atlanta Hawks': 'ATL',
-    'Detroit Pistons': 'DET',
-    'Minnesota Timberwolves': 'MIN',
-    'Cleveland Cavaliers': 'CLE',
-    'New Orleans Pelicans': 'NOP',
-    'Oklahoma City Thunder': 'OKC',
-    'Sacramento Kings': 'SAC',
-    'Dallas Mavericks': 'DAL',
-    'Portland Trail Blazers': 'POR',
-    'Philadelphia 76ers': 'PHI',
-    'Denver Nuggets': 'DEN',
-    'New York Knicks': 'NYK',
-    'Miami Heat': 'MIA',
-    'Toronto Raptors': 'TOR',
-    'Brooklyn Nets': 'BKN',
-    'Los Angeles Clippers': 'LAC',
-    'Orlando Magic': 'ORL',
-    'Golden State Warriors': 'GSW',
-    'Chicago Bulls': 'CHI',
-    'Memphis Grizzlies': 'MEM',
-    'Indiana Pacers': 'IND',
-    'Utah Jazz': 'UTA',
-    'San Antonio Spurs': 'SAS',
-    'Milwaukee Bucks': 'MIL',
-    'Charlotte Hornets': 'CHA'
-}
-
 # Helper functions
-@st.cache_data
-
-def expected_score(rating_a, rating_b):
-    return 1 / (1 + 10 ** ((rating_b - rating_a) / 400))
-
-def update_elo(rating, expected, actual, k=20):
-    return rating + k * (actual - expected)
-
-def calculate_elos(schedule, current_elos, elo_histories):
-    for index, row in schedule.iterrows():
-        away = row['Visitor/Neutral']
-        away_score = int(row['away_pts'])
-        home = row['Home/Neutral']
-        home_score = int(row['home_pts'])
-        home_elo = current_elos[home]
-        away_elo = current_elos[away]
-
-        result = 1 if home_score > away_score else 0
-        
-        expected_home_score = expected_score(current_elos[home], current_elos[away])
-        expected_away_score = expected_score(current_elos[away], current_elos[home])
-        new_rating_home = update_elo(home_elo, expected_home_score, result)
-        new_rating_away = update_elo(away_elo, expected_away_score, 1 - result)
-
-        elo_histories[home].append(new_rating_home)
-        elo_histories[away].append(new_rating_away)
-
-        current_elos[home] = new_rating_home
-        current_elos[away] = new_rating_away
-    
-    return current_elos, elo_histories
-
-def elo_bar_plot(current_elos):
-    TEAM_NAMES = list(TEAM_ABBRS.keys())
-    x = TEAM_NAMES
-    y = [current_elos[i] for i in TEAM_NAMES]
-    bar_colors = [TEAM_COLORS[i] for i in TEAM_NAMES]
-
-    sorted_indices = sorted(range(len(TEAM_NAMES)), key=lambda i: current_elos[TEAM_NAMES[i]])
-    sorted_x = [TEAM_NAMES[i] for i in sorted_indices]
-    sorted_y = [current_elos[TEAM_NAMES[i]] for i in sorted_indices]
-    sorted_bar_colors = [TEAM_COLORS[TEAM_NAMES[i]] for i in sorted_indices]
+# Everything derived from the NBA's schedule is memoized on its League, which
+# empties the memo whenever a new schedule is rated
+def load_analytics(league):
+    def compute():
+        current_elos = league.initial_elos()
+        schedule_path, schema = league.config['schedule_path'], league.config['schedule_schema']
+        games = game_frame(rate_games(games_from_csv(schedule_path, schema), current_elos, league.config['k']))
+        summary = team_summary(games, unplayed_games_from_csv(schedule_path, schema), current_elos)
+        return summary, conference_summary(games)
+    return league.cached('analytics', compute)
+
+def load_glicko_histories(league):
+    # Same replay as the Elo histories, run through the Glicko engine instead
+    def compute():
+        current_elos = league.initial_elos()
+        engine = GlickoEngine(current_elos.keys())
+        elo_histories = {name: [current_elos[name]] for name in current_elos}
+        rd_histories = {name: [engine.rd_of(name)] for name in current_elos}
+        games = games_from_csv(league.config['schedule_path'], league.config['schedule_schema'])
+        run_pipeline(games, current_elos, sinks=[history_sink(elo_histories), rd_sink(rd_histories)], engine=engine)
+        return elo_histories, rd_histories
+    return league.cached('glicko', compute)
+
+def load_season_replay(league):
+    # Shared by every session; scenarios only ever read from it
+    def compute():
+        games = games_from_csv(league.config['schedule_path'], league.config['schedule_schema'])
+        return SeasonReplay(games, league.initial_elos(), k=league.config['k'])
+    return league.cached('season_replay', compute)
+
+def load_downloads(league):
+    # Every download is built once per schedule, so clicking one never recomputes anything
+    return league.cached('downloads', lambda: export_tables(ratings_data(*league.ratings()), league.version))
+
+@st.cache_resource
+def load_league_host():
+    return LeagueHost()
+
+def league_view(league):
+    # The core charts for a league other than the NBA
+    current_elos, elo_histories = league.refresh().ratings()
+    team_names = sorted(elo_histories)
 
-    fig = go.Figure(data=[go.Bar(
-        x=sorted_x,
-        y=sorted_y,
-        marker_color=sorted_bar_colors
-    )])
+    tab1, tab2, tab3 = st.tabs(["Rating History", "Current Rating", "Rating Changes"])
 
-    fig.update_layout(
-        height=600,
-        plot_bgcolor='white',
-        yaxis=dict(
-            range=[1000, None]
+    with tab1:
+        st.header(f"{league.name} Elo Rating History")
+        focused_teams = st.multiselect(
+            "Select teams to highlight:",
+            options=team_names,
+            default=team_names[:1]
         )
-    )
-
-    fig.update_xaxes(
-        mirror=True,
-        ticks='outside',
-        showline=True,
-        linecolor='black',
-        gridcolor='lightgrey'
-    )
-    fig.update_yaxes(
-        mirror=True,
-        ticks='outside',
-        showline=True,
-        linecolor='black',
-        gridcolor='lightgrey',
-        autorange=False,
-        range=[sorted_y[0]+-100, sorted_y[-1] + 50]
-    )
-
-    return fig
+        fig_line = elo_line_plot(elo_histories, focused_teams, colors=league.colors, abbrs=league.abbrs, league=league.name)
+        st.plotly_chart(fig_line, use_container_width=True)
 
-def elo_line_plot(elo_histories, focused_teams=None):
-    games = list(range(0, 83))
-    
-    fig = go.Figure()
-    
-    # Convert focused_teams to list if it's None
-    if focused_teams is None:
-        focused_teams = ['Golden State Warriors'] # go dubs
-    
-    # Add teams with enhanced styling
-    for team, elo in elo_histories.items():
-        # Determine line styling based on whether this is a focused team
-        if team in focused_teams:
-            line_width = 4
-            opacity = 1.0
-        else:
-            line_width = 1
-            opacity = 0.2
-        
-        # Add the line trace
-        fig.add_trace(go.Scatter(
-            x=games,
-            y=elo,
-            mode='lines',
-            name=TEAM_ABBRS[team],
-            line=dict(
-                color=TEAM_COLORS[team],
-                width=line_width
-            ),
-            opacity=opacity,
-            hovertemplate=f"{team}<br>Game: %{{x}}<br>Elo: %{{y}}<extra></extra>"
-        ))
-        
-        # Add end-of-line labels
-        if team in focused_teams or not focused_teams:
-            fig.add_annotation(
-                x=games[-1],
-                y=elo[-1],
-                text=TEAM_ABBRS[team],
-                xanchor='left',
-                yanchor='middle',
-                xshift=5,
-                showarrow=False,
-                font=dict(
-                    size=10,
-                    color=TEAM_COLORS[team]
-                ),
-                opacity=opacity
-            )
+    with tab2:
+        st.header(f"Current {league.name} Team Elo Ratings")
+        if current_elos:
+            st.plotly_chart(elo_bar_plot(current_elos, colors=league.colors), use_container_width=True)
 
-    fig.update_layout(
-        title=dict(
-            text='NBA Team Elo Ratings Throughout Season',
-            x=0.5,
-            y=0.95,
-            xanchor='center',
-            yanchor='top',
-            font=dict(size=24)
-        ),
-        height=600,
-        plot_bgcolor='white',
-        showlegend=False,
-        margin=dict(r=100),
-        xaxis_title="Games Played",
-        yaxis_title="Elo Rating",
-        hovermode='closest'
-    )
-    
-    fig.update_xaxes(
-        mirror=True,
-        ticks='outside',
-        showline=True,
-        linecolor='black',
-        gridcolor='lightgrey',
-        zeroline=False,
-        tickmode='linear',
-        tick0=0,
-        dtick=10
-    )
-    
-    fig.update_yaxes(
-        mirror=True,
-        ticks='outside',
-        showline=True,
-        linecolor='black',
-        gridcolor='lightgrey',
-        zeroline=False,
-        tickformat='.0f'
-    )
-    
-    return fig
+    with tab3:
+        st.header("Elo Rating Changes")
+        elo_deltas = {name: elo_histories[name][-1] - elo_histories[name][0] for name in team_names}
+        if elo_deltas:
+            st.plotly_chart(elo_delta_plot(elo_deltas, colors=league.colors, abbrs=league.abbrs), use_container_width=True)
 
-def elo_delta_plot(deltas):
-    sorted_teams = sorted(deltas.keys(), key=lambda x: deltas[x])
-    x = [TEAM_ABBRS[team] for team in sorted_teams]
-    y = [deltas[team] for team in sorted_teams]
-    colors = [TEAM_COLORS[team] for team in sorted_teams]
-    
-    fig = go.Figure(data=[go.Bar(
-        x=x,
-        y=y,
-        marker_color=colors
-    )])
-    
-    max_delta = max(y)
-    min_delta = min(y)
-    padding = (max_delta - min_delta) * 0.1
-    
-    fig.update_layout(
-        height=600,
-        plot_bgcolor='white',
-        showlegend=False,
-        shapes=[dict(
-            type='line',
-            x0=-0.5,
-            x1=len(x) - 0.5,
-            y0=0,
-            y1=0,
-            line=dict(
-                color='black',
-                width=1
-            )
-        )]
-    )
-    
-    fig.update_xaxes(
-        tickangle=45,
-        mirror=True,
-        ticks='outside',
-        showline=True,
-        linecolor='black',
-        gridcolor='lightgrey'
-    )
-    
-    fig.update_yaxes(
-        mirror=True,
-        ticks='outside',
-        showline=True,
-        linecolor='black',
-        gridcolor='lightgrey',
-        range=[min_delta - padding, max_delta + padding]
-    )
-    
-    return fig
+def load_live_snapshot(path):
+    # Written by live.py while games are in progress. A snapshot that hasn't
+    # been updated in hours is from an earlier night and is ignored.
+    try:
+        with open(path) as f:
+            snapshot = json.load(f)
+        if time.time() - snapshot['updated'] > SNAPSHOT_MAX_AGE:
+            return []
+        return snapshot['games']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return []
 
 # Main app logic
 def main():
-    # Load initial Elos
-    try:
-        with open('2023-24/final_elos.pkl', 'rb') as f:
-            current_elos = pickle.load(f)
-    except FileNotFoundError:
-        st.error("Error: Could not load initial Elo ratings file.")
+    # Other leagues get the core charts when their schedules are available
+    host = load_league_host()
+    league_names = host.available()
+    if len(league_names) > 1:
+        league_name = st.sidebar.selectbox("League", options=league_names)
+        if league_name != 'NBA':
+            league_view(host[league_name])
+            return
+
+    if 'NBA' not in host:
+        st.error("Error: Could not load the NBA schedule.")
         return
 
-    schedule = pd.read_csv('2025_schedule.csv', index_col=False)
-
-    # Initialize elo histories
-    elo_histories = {}
-    team_names = list(schedule['Visitor/Neutral'].unique())
-    for name in team_names:
-        elo_histories[name] = [current_elos[name]]
-
-    # Calculate current Elos
-    current_elos, elo_histories = calculate_elos(schedule, current_elos, elo_histories)
+    # Rated once per schedule update and shared by every session
+    league = host['NBA'].refresh()
+    current_elos, elo_histories = league.ratings()
+    team_names = list(current_elos.keys())
 
     # Create tabs for different visualizations
-    tab1, tab2, tab3 = st.tabs(["Rating History", "Current Rating", "Rating Changes"])
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(["Rating History", "Current Rating", "Rating Changes", "Strength of Schedule", "Conference Splits", "What If", "Live"])
+    summary, conferences = load_analytics(league)
 
 
     with tab1:
@@ -363,7 +145,18 @@ def main():
             help="You can select multiple teams to compare their performance"
         )
         
-        fig_line = elo_line_plot(elo_histories, focused_teams)
+        engine = st.radio(
+            "Rating engine:",
+            options=["Elo", "Glicko"],
+            horizontal=True,
+            help="Glicko also tracks how uncertain each rating is - highlighted teams get a shaded band covering two rating deviations either side"
+        )
+
+        if engine == "Glicko":
+            glicko_histories, rd_histories = load_glicko_histories(league)
+            fig_line = elo_line_plot(glicko_histories, focused_teams, bands=rd_histories)
+        else:
+            fig_line = elo_line_plot(elo_histories, focused_teams)
         st.plotly_chart(fig_line, use_container_width=True)
 
 
@@ -381,6 +174,107 @@ def main():
         fig_delta = elo_delta_plot(elo_deltas)
         st.plotly_chart(fig_delta, use_container_width=True)
 
+    with tab4:
+        st.header("Strength of Schedule")
+        st.write("The average pre-game Elo of every opponent a team has faced so far. Teams on the right have had the toughest road!")
+        if len(summary):
+            st.plotly_chart(sos_bar_plot(summary), use_container_width=True)
+            df_sos = pd.DataFrame({
+                'Team': summary.index,
+                'SOS': summary['sos'].round(1).to_numpy(),
+                'Remaining SOS': summary['remaining_sos'].round(1).to_numpy(),
+                'Games Left': summary['remaining_games'].to_numpy()
+            })
+            st.dataframe(df_sos, use_container_width=True, hide_index=True)
+
+    with tab5:
+        st.header("Conference Splits")
+        st.write("Is the East really weaker? Here's how each conference does against the other, and how each team's record compares to what their Elo expected.")
+        if len(conferences):
+            df_conf = pd.DataFrame({
+                'Conference': conferences.index,
+                'Cross-Conference Record': [f"{w}-{g - w}" for w, g in zip(conferences['cross_wins'], conferences['cross_games'])],
+                'Expected Wins': conferences['cross_expected_wins'].round(1).to_numpy(),
+                'Average Elo': conferences['mean_elo'].round(1).to_numpy()
+            })
+            st.dataframe(df_conf, use_container_width=True, hide_index=True)
+        if len(summary):
+            df_split = pd.DataFrame({
+                'Team': summary.index,
+                'Conference': summary['conference'].to_numpy(),
+                'Record': [f"{w}-{l}" for w, l in zip(summary['wins'], summary['losses'])],
+                'In Conference': [f"{w}-{l}" for w, l in zip(summary['intra_wins'], summary['intra_losses'])],
+                'Cross Conference': [f"{w}-{l}" for w, l in zip(summary['cross_wins'], summary['cross_losses'])],
+                'Expected Wins': summary['expected_wins'].round(1).to_numpy(),
+                'Wins Over Expected': summary['wins_over_expected'].round(1).to_numpy()
+            }).sort_values('Wins Over Expected', ascending=False)
+            st.dataframe(df_split, use_container_width=True, hide_index=True)
+
+    with tab6:
+        st.header("What If?")
+        st.write("What if your team had won that one? Flip the results of any games below and see where everyone's Elo would stand.")
+        base = load_season_replay(league)
+        whatif_team = st.selectbox(
+            "Select a team:",
+            options=sorted(base.teams),
+            index=sorted(base.teams).index('Golden State Warriors')  # go dubs
+        )
+        team_i = base.index[whatif_team]
+        team_games = base.team_games(whatif_team)
+        is_home = base.home_idx[team_games] == team_i
+        actual_wins = base.home_won[team_games] == is_home
+        df_games = pd.DataFrame({
+            'Date': [base.games[i].date for i in team_games],
+            'Opponent': [base.teams[a] if home else base.teams[h] for h, a, home in zip(base.home_idx[team_games], base.away_idx[team_games], is_home)],
+            'Home': is_home,
+            'Score': [f"{base.games[i].home_pts}-{base.games[i].away_pts}" if home else f"{base.games[i].away_pts}-{base.games[i].home_pts}" for i, home in zip(team_games, is_home)],
+            'Won': actual_wins
+        })
+        edited = st.data_editor(
+            df_games,
+            disabled=['Date', 'Opponent', 'Home', 'Score'],
+            use_container_width=True,
+            hide_index=True,
+            key=f"whatif_{whatif_team}"
+        )
+
+        # A flipped result for this team is a flipped home result for the game
+        flipped = edited['Won'].to_numpy() != actual_wins
+        overrides = {int(i): bool(won == home) for i, won, home in zip(team_games[flipped], edited['Won'].to_numpy()[flipped], is_home[flipped])}
+        if not overrides:
+            st.info("Flip a result in the table above to see what would have happened.")
+        else:
+            start = time.perf_counter()
+            scenario = base.scenario(overrides)
+            deltas = scenario.deltas()
+            elapsed = (time.perf_counter() - start) * 1000
+            st.metric(
+                f"{whatif_team} Elo",
+                round(scenario.final[team_i], 1),
+                delta=round(deltas[whatif_team], 1)
+            )
+            st.write("How every team's current Elo would change:")
+            st.plotly_chart(elo_delta_plot(deltas), use_container_width=True)
+            st.caption(f"Re-rated {len(base.games) - scenario.start} games in {elapsed:.1f} ms")
+
+    with tab7:
+        st.header("Live Win Probabilities")
+        st.write("Win probabilities for tonight's games as they happen, combining each team's pre-game Elo with the score and time remaining. Rating changes are provisional until the final buzzer.")
+        live_games = load_live_snapshot(snapshot_path(league.name))
+        if not live_games:
+            st.info("No games in progress right now.")
+        else:
+            df_live = pd.DataFrame({
+                'Matchup': [f"{league.abbrs.get(g['away'], g['away'])} @ {league.abbrs.get(g['home'], g['home'])}" for g in live_games],
+                'Score': [f"{g['away_pts']}-{g['home_pts']}" for g in live_games],
+                'Time Left': [f"{int(g['seconds_remaining']) // 60}:{int(g['seconds_remaining']) % 60:02d}" for g in live_games],
+                'Home Win %': [round(g['home_win_prob'] * 100, 1) for g in live_games],
+                'Home Elo Change': [round(g['home_delta'], 1) for g in live_games],
+                'Away Elo Change': [round(g['away_delta'], 1) for g in live_games]
+            })
+            st.dataframe(df_live, use_container_width=True, hide_index=True)
+            st.button("Refresh")
+
     # Add a data table section
     st.header("Team Ratings Data")
     df_ratings = pd.DataFrame({
@@ -391,5 +285,16 @@ def main():
     df_ratings = df_ratings.sort_values('Current Elo', ascending=False)
     st.dataframe(df_ratings, use_container_width=True, hide_index=True)
 
+    downloads = load_downloads(league)
+    mime_types = {'csv': 'text/csv', 'json': 'application/json', 'parquet': 'application/octet-stream'}
+    download_columns = st.columns(len(downloads))
+    for column, ((name, fmt), content) in zip(download_columns, downloads.items()):
+        column.download_button(
+            f"{name.title()} ({fmt.upper()})",
+            data=content,
+            file_name=f"elo_{name}.{fmt}",
+            mime=mime_types[fmt]
+        )
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
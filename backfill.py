@@ -0,0 +1,141 @@
+import argparse
+import glob
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from elo import rate_games
+from glicko import GlickoEngine
+from fixtures import FIXTURE_DIR, load_index, load_object
+from pipeline import SCHEDULE_COLUMNS, Game, game_from_row
+from scraper import archived_month_urls, month_order, parse_schedule_page
+from teams import canonical_team
+
+INITIAL_ELO = 1500
+
+def season_pages(season, pages_dir=None, root=FIXTURE_DIR):
+    # Month pages for one season, in order, either from a directory of saved
+    # basketball-reference pages (NBA_1985_games-october.html, ...) or from the fixture archive
+    if pages_dir is not None:
+        paths = sorted(glob.glob(os.path.join(pages_dir, f"NBA_{season}_games-*.html")), key=month_order)
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                yield f.read()
+    else:
+        index = load_index(root)
+        for url in archived_month_urls(season, root):
+            yield load_object(index[url]['sha256'], root)
+
+def load_season(season, pages_dir=None, root=FIXTURE_DIR):
+    # Parses and normalizes one season into columns. Runs in a worker process.
+    columns = {'date': [], 'away': [], 'away_pts': [], 'home': [], 'home_pts': []}
+    for html in season_pages(season, pages_dir, root):
+        for row in parse_schedule_page(html):
+            game = game_from_row(dict(zip(SCHEDULE_COLUMNS, row)))
+            if game is None:
+                continue
+            columns['date'].append(game.date)
+            columns['away'].append(canonical_team(game.away, season))
+            columns['away_pts'].append(game.away_pts)
+            columns['home'].append(canonical_team(game.home, season))
+            columns['home_pts'].append(game.home_pts)
+    return season, columns
+
+def _load_season(args):
+    return load_season(*args)
+
+def chain_ratings(seasons, current_elos=None, regress=0.0, engine=rate_games):
+    # Rates the seasons back to back, carrying every team's rating over. With
+    # regress > 0 ratings are pulled that fraction of the way back to 1500
+    # between seasons. Teams seen for the first time start at 1500. Engines
+    # with a new_season() hook (glicko.GlickoEngine) get it called between seasons.
+    current_elos = {} if current_elos is None else current_elos
+    frames = []
+    for n, (season, columns) in enumerate(seasons):
+        if n > 0 and hasattr(engine, 'new_season'):
+            engine.new_season()
+        for team, rating in current_elos.items():
+            current_elos[team] = rating + regress * (INITIAL_ELO - rating)
+        for team in set(columns['home']) | set(columns['away']):
+            current_elos.setdefault(team, INITIAL_ELO)
+
+        games = (Game(*values) for values in zip(columns['date'], columns['away'], columns['away_pts'], columns['home'], columns['home_pts']))
+        before_home, before_away, after_home, after_away, rd_home, rd_away = [], [], [], [], [], []
+        for rated in engine(games, current_elos):
+            before_home.append(rated.home_before)
+            before_away.append(rated.away_before)
+            after_home.append(rated.home_after)
+            after_away.append(rated.away_after)
+            rd_home.append(rated.home_rd)
+            rd_away.append(rated.away_rd)
+
+        frame = pd.DataFrame(columns)
+        frame.insert(0, 'season', season)
+        frame['home_elo_before'] = before_home
+        frame['away_elo_before'] = before_away
+        frame['home_elo_after'] = after_home
+        frame['away_elo_after'] = after_away
+        if any(rd is not None for rd in rd_home):
+            frame['home_rd'] = rd_home
+            frame['away_rd'] = rd_away
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(), current_elos
+    history = pd.concat(frames, ignore_index=True)
+    history['date'] = pd.to_datetime(history['date'], format='%a, %b %d, %Y')
+    return history, current_elos
+
+def write_store(history, path):
+    # Parquet needs pyarrow or fastparquet; without either fall back to gzipped CSV
+    try:
+        history.to_parquet(path, index=False)
+        return path
+    except ImportError:
+        path = os.path.splitext(path)[0] + '.csv.gz'
+        history.to_csv(path, index=False)
+        return path
+
+def backfill(start, end, out='history.parquet', pages_dir=None, root=FIXTURE_DIR, workers=None, regress=0.0, final_elos=None, engine=rate_games):
+    timings = {}
+    seasons = list(range(start, end + 1))
+
+    # Seasons are independent until they're rated, so parsing fans out across processes
+    t = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parsed = list(executor.map(_load_season, [(season, pages_dir, root) for season in seasons]))
+    timings['parse'] = time.perf_counter() - t
+
+    # Ratings depend on every earlier game, so they're chained in one process
+    t = time.perf_counter()
+    history, current_elos = chain_ratings(parsed, regress=regress, engine=engine)
+    timings['rate'] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    path = write_store(history, out)
+    if final_elos is not None:
+        with open(final_elos, 'wb') as f:
+            pickle.dump(current_elos, f)
+    timings['write'] = time.perf_counter() - t
+
+    print(f"Backfilled {len(history)} games from {len(seasons)} seasons into '{path}'")
+    print(', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items()))
+    return history, current_elos, timings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rate many past seasons from archived or saved schedule pages")
+    parser.add_argument('--start', type=int, required=True, help="first season, named by the year it ends in")
+    parser.add_argument('--end', type=int, required=True, help="last season, named by the year it ends in")
+    parser.add_argument('--pages', help="directory of saved pages (default: the fixture archive)")
+    parser.add_argument('--out', default='history.parquet')
+    parser.add_argument('--workers', type=int, help="processes used to parse seasons")
+    parser.add_argument('--regress', type=float, default=0.0, help="fraction each rating moves back to 1500 between seasons")
+    parser.add_argument('--engine', choices=['elo', 'glicko'], default='elo', help="rating engine to chain the seasons with")
+    parser.add_argument('--final-elos', help="also pickle the final ratings here, like 2023-24/final_elos.pkl")
+    args = parser.parse_args()
+    engine = GlickoEngine() if args.engine == 'glicko' else rate_games
+    backfill(args.start, args.end, args.out, args.pages, workers=args.workers, regress=args.regress,
+             final_elos=args.final_elos, engine=engine)
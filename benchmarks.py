@@ -0,0 +1,123 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+from backfill import backfill
+from leagues import LEAGUES, MONTHS, LeagueHost
+from pipeline import Game
+from teams import TEAM_ABBRS, TEAM_ALIASES
+
+# Wall-clock benchmarks on synthetic data, so they run without the network
+# or a fixture archive
+
+def _team_names(season):
+    # The names the franchises played under that season, so renames are
+    # exercised too. A franchise whose current name another team was using
+    # (Charlotte before 2005) sits the season out.
+    former = {franchise: name for (name, first, last), franchise in TEAM_ALIASES.items() if first <= season <= last}
+    taken = set(former.values())
+    return [former.get(team, team) for team in TEAM_ABBRS if team in former or team not in taken]
+
+def synthetic_games(teams, games=1230, seed=0, start=date(2024, 10, 22)):
+    # A schedule that passes validation.validate_schedule: games come in
+    # rounds where every team plays once, each round on its own date, so no
+    # game repeats on a date and with 1230 games each of 30 teams plays 82.
+    # Scores are redrawn until they differ, since there are no ties.
+    rng = random.Random(seed)
+    per_round = len(teams) // 2
+    rounds = -(-games // per_round)
+    span = max(170, rounds)
+    result = []
+    for r in range(rounds):
+        day = (start + timedelta(days=r * span // rounds)).strftime('%a, %b %d, %Y')
+        order = rng.sample(teams, len(teams))
+        for j in range(min(per_round, games - len(result))):
+            away, home = order[2 * j], order[2 * j + 1]
+            away_pts = home_pts = 0
+            while away_pts == home_pts:
+                away_pts, home_pts = rng.randint(85, 130), rng.randint(85, 130)
+            result.append(Game(day, away, away_pts, home, home_pts))
+    return result
+
+def write_synthetic_season(pages_dir, season, games=1230, seed=0):
+    # Month pages laid out like basketball-reference's, data-stat attributes included
+    by_month = {}
+    for game in synthetic_games(_team_names(season), games, seed + season, date(season - 1, 10, 25)):
+        cells = (
+            f'<th data-stat="date_game">{game.date}</th>'
+            f'<td data-stat="visitor_team_name">{game.away}</td>'
+            f'<td data-stat="visitor_pts">{game.away_pts}</td>'
+            f'<td data-stat="home_team_name">{game.home}</td>'
+            f'<td data-stat="home_pts">{game.home_pts}</td>'
+            f'<td data-stat="box_score_text">Box Score</td>'
+            f'<td data-stat="overtimes"></td>'
+            f'<td data-stat="attendance">18,000</td>'
+            f'<td data-stat="arena_name">Arena</td>'
+            f'<td data-stat="game_remarks"></td>'
+        )
+        month = datetime.strptime(game.date, '%a, %b %d, %Y').strftime('%B').lower()
+        by_month.setdefault(month, []).append(f'<tr>{cells}</tr>')
+
+    for month in MONTHS:
+        if month not in by_month:
+            continue
+        with open(os.path.join(pages_dir, f"NBA_{season}_games-{month}.html"), 'w', encoding='utf-8') as f:
+            f.write('<html><body><table id="schedule"><thead><tr><th>Date</th></tr></thead><tbody>')
+            f.write(''.join(by_month[month]))
+            f.write('</tbody></table></body></html>')
+
+def bench_backfill(seasons=40, workers=(1, None)):
+    end = 2025
+    start = end - seasons + 1
+    with tempfile.TemporaryDirectory() as tmp:
+        pages_dir = os.path.join(tmp, 'pages')
+        os.makedirs(pages_dir)
+        for season in range(start, end + 1):
+            write_synthetic_season(pages_dir, season)
+
+        results = {}
+        for n in workers:
+            t = time.perf_counter()
+            backfill(start, end, os.path.join(tmp, 'history.parquet'), pages_dir, workers=n)
+            results[n or os.cpu_count()] = time.perf_counter() - t
+
+    print(f"\n{seasons}-season backfill")
+    for n, seconds in results.items():
+        print(f"  {n:>3} workers: {seconds:.2f}s")
+    return results
+
+def bench_leagues(leagues=10, games=1230):
+    # N NBA-sized leagues hosted side by side, each with a full season
+    host = LeagueHost()
+    nba = LEAGUES['NBA']
+    seasons = [synthetic_games(nba['teams'], games, seed=i) for i in range(leagues)]
+
+    tracemalloc.start()
+    t = time.perf_counter()
+    for i, season in enumerate(seasons):
+        config = dict(nba, name=f"League {i}", initial_elos=None)
+        host.add(config).load(season)
+    elapsed = time.perf_counter() - t
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"\n{leagues} leagues x {games} games")
+    print(f"  load: {elapsed:.3f}s ({elapsed / leagues * 1000:.1f} ms per league)")
+    print(f"  peak memory while loading: {peak / 1e6:.1f} MB")
+    return elapsed, peak
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run wall-clock benchmarks on synthetic data")
+    parser.add_argument('benchmark', choices=['backfill', 'leagues'])
+    parser.add_argument('--seasons', type=int, default=40)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count()])
+    parser.add_argument('--leagues', type=int, default=10)
+    args = parser.parse_args()
+    if args.benchmark == 'backfill':
+        bench_backfill(args.seasons, args.workers)
+    else:
+        bench_leagues(args.leagues)
@@ -0,0 +1,35 @@
+from collections import namedtuple
+
+# A game after it has been run through a rating engine, with both teams'
+# ratings before and after the result was applied. Engines that track
+# uncertainty also fill in each team's rating deviation after the game.
+RatedGame = namedtuple(
+    'RatedGame',
+    ['game', 'home_before', 'away_before', 'home_after', 'away_after', 'home_rd', 'away_rd'],
+    defaults=(None, None)
+)
+
+def expected_score(rating_a, rating_b):
+    return 1 / (1 + 10 ** ((rating_b - rating_a) / 400))
+
+def update_elo(rating, expected, actual, k=20):
+    return rating + k * (actual - expected)
+
+def rate_games(games, current_elos, k=20):
+    # Rating stage of the pipeline: consumes games one at a time, updates
+    # current_elos in place and yields each game with its rating change
+    for game in games:
+        home_elo = current_elos[game.home]
+        away_elo = current_elos[game.away]
+
+        result = 1 if game.home_pts > game.away_pts else 0
+
+        expected_home_score = expected_score(home_elo, away_elo)
+        expected_away_score = expected_score(away_elo, home_elo)
+        new_rating_home = update_elo(home_elo, expected_home_score, result, k)
+        new_rating_away = update_elo(away_elo, expected_away_score, 1 - result, k)
+
+        current_elos[game.home] = new_rating_home
+        current_elos[game.away] = new_rating_away
+
+        yield RatedGame(game, home_elo, away_elo, new_rating_home, new_rating_away)
@@ -0,0 +1,141 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import pickle
+
+import pandas as pd
+
+from pipeline import data_version, games_from_csv, history_sink, run_pipeline
+from plots import elo_bar_plot, elo_line_plot, elo_delta_plot
+
+EXPORT_DIR = 'exports'
+CACHE_DIR = os.path.join(EXPORT_DIR, 'cache')
+
+# Same size as the manual exports made with 2024-25/plotting.py
+IMAGE_WIDTH = 2000
+IMAGE_HEIGHT = 1200
+
+FIGURES = {
+    'elo_bar_plot': lambda data, params: elo_bar_plot(data['current_elos']),
+    'elo_line_plot': lambda data, params: elo_line_plot(data['elo_histories'], params.get('focused_teams')),
+    'elo_delta_plot': lambda data, params: elo_delta_plot(data['deltas'])
+}
+
+def ratings_data(current_elos, elo_histories):
+    # What the figures and tables are drawn from, e.g. a leagues.League's ratings()
+    return {
+        'current_elos': current_elos,
+        'elo_histories': elo_histories,
+        'deltas': {name: elo_histories[name][-1] - elo_histories[name][0] for name in elo_histories}
+    }
+
+def season_data(initial_path='2023-24/final_elos.pkl', schedule_path='2025_schedule.csv'):
+    with open(initial_path, 'rb') as f:
+        current_elos = pickle.load(f)
+    elo_histories = {name: [current_elos[name]] for name in current_elos}
+    run_pipeline(games_from_csv(schedule_path), current_elos, sinks=[history_sink(elo_histories)])
+    return ratings_data(current_elos, elo_histories)
+
+def season_version(initial_path='2023-24/final_elos.pkl', schedule_path='2025_schedule.csv'):
+    return data_version(initial_path)[:12] + data_version(schedule_path)[:12]
+
+def cache_key(version, name, fmt, params):
+    payload = json.dumps({'version': version, 'name': name, 'format': fmt, 'params': params}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def render_figure(name, data, version, fmt='png', params=None, width=IMAGE_WIDTH, height=IMAGE_HEIGHT):
+    # Returns the path of the rendered image, rendering it only if this
+    # figure hasn't already been drawn for this data version and parameters
+    params = dict(params or {})
+    path = os.path.join(CACHE_DIR, f"{cache_key(version, name, fmt, dict(params, width=width, height=height))}.{fmt}")
+    if os.path.exists(path):
+        return path
+
+    fig = FIGURES[name](data, params)
+    fig.update_layout(autosize=False, width=width, height=height)
+    try:
+        image = fig.to_image(format=fmt, width=width, height=height)
+    except (ImportError, ValueError, RuntimeError) as e:
+        raise RuntimeError(f"Static image export needs kaleido and a Chrome it can drive (pip install kaleido, then plotly_get_chrome): {e}") from e
+    _write_atomic(path, image)
+    return path
+
+# Data exports
+
+def ratings_table(data):
+    # Same table as the app's "Team Ratings Data" section
+    current_elos, elo_histories = data['current_elos'], data['elo_histories']
+    df = pd.DataFrame({
+        'Team': list(current_elos.keys()),
+        'Current Elo': [round(elo, 1) for elo in current_elos.values()],
+        'Change': [round(elo_histories[team][-1] - elo_histories[team][0], 1) for team in current_elos.keys()]
+    })
+    return df.sort_values('Current Elo', ascending=False)
+
+def histories_table(data):
+    rows = [(team, game, elo) for team, elos in data['elo_histories'].items() for game, elo in enumerate(elos)]
+    return pd.DataFrame(rows, columns=['Team', 'Game', 'Elo'])
+
+def table_bytes(df, fmt):
+    if fmt == 'csv':
+        return df.to_csv(index=False).encode()
+    if fmt == 'json':
+        return df.to_json(orient='records').encode()
+    if fmt == 'parquet':
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False)
+        return buffer.getvalue()
+    raise ValueError(f"Unknown export format: {fmt}")
+
+def table_formats():
+    # Parquet is only offered when pandas has an engine for it
+    formats = ['csv', 'json']
+    try:
+        pd.DataFrame({'a': [1]}).to_parquet(io.BytesIO())
+        formats.append('parquet')
+    except ImportError:
+        pass
+    return formats
+
+def export_tables(data, version):
+    # Every table in every format, keyed by (table, format), built once per data version
+    tables = {'ratings': ratings_table(data), 'histories': histories_table(data)}
+    return {(name, fmt): table_bytes(df, fmt) for name, df in tables.items() for fmt in table_formats()}
+
+def export_all(formats=('png',), out_dir=EXPORT_DIR, focused_teams=None):
+    version = season_version()
+    data = season_data()
+    params = {'elo_line_plot': {'focused_teams': focused_teams or ['Golden State Warriors']}}  # go dubs
+
+    written = []
+    for name in FIGURES:
+        for fmt in formats:
+            cached = render_figure(name, data, version, fmt, params.get(name))
+            path = os.path.join(out_dir, f"{name}.{fmt}")
+            with open(cached, 'rb') as f:
+                _write_atomic(path, f.read())
+            written.append(path)
+
+    for (name, fmt), content in export_tables(data, version).items():
+        path = os.path.join(out_dir, f"{name}.{fmt}")
+        _write_atomic(path, content)
+        written.append(path)
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the season's charts and ratings")
+    parser.add_argument('--formats', nargs='+', default=['png'], choices=['png', 'svg', 'pdf', 'jpeg', 'webp'])
+    parser.add_argument('--out', default=EXPORT_DIR)
+    parser.add_argument('--teams', nargs='+', help="teams to highlight in the rating history chart")
+    args = parser.parse_args()
+    for path in export_all(args.formats, args.out, args.teams):
+        print(path)
@@ -0,0 +1,56 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+
+# Local archive of every page the scraper has fetched. Pages are stored
+# gzipped under their SHA-256, so identical fetches share one object, and
+# index.json maps each URL to its most recent object.
+FIXTURE_DIR = 'fixtures'
+
+def _object_path(digest, root=FIXTURE_DIR):
+    return os.path.join(root, 'objects', digest[:2], f"{digest}.html.gz")
+
+def _index_path(root=FIXTURE_DIR):
+    return os.path.join(root, 'index.json')
+
+def load_index(root=FIXTURE_DIR):
+    try:
+        with open(_index_path(root)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def _write_index(index, root=FIXTURE_DIR):
+    tmp_path = _index_path(root) + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, _index_path(root))
+
+def store_page(url, html, root=FIXTURE_DIR):
+    data = html.encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()
+    path = _object_path(digest, root)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        # mtime=0 keeps the compressed bytes identical for identical pages
+        with gzip.GzipFile(tmp_path, 'wb', mtime=0) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    index = load_index(root)
+    index[url] = {'sha256': digest, 'fetched': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    _write_index(index, root)
+    return digest
+
+def load_object(digest, root=FIXTURE_DIR):
+    with gzip.open(_object_path(digest, root), 'rb') as f:
+        return f.read().decode('utf-8')
+
+def load_page(url, root=FIXTURE_DIR):
+    entry = load_index(root).get(url)
+    if entry is None:
+        raise KeyError(f"No archived copy of {url}")
+    return load_object(entry['sha256'], root)
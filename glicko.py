@@ -0,0 +1,87 @@
+import math
+
+import numpy as np
+
+from elo import RatedGame
+from pipeline import parse_date
+
+Q = math.log(10) / 400
+
+# Rating deviation a team starts the season with when carried over from last year
+SEASON_START_RD = 100.0
+# Deviation of a brand new team with nothing to go on
+MAX_RD = 350.0
+# Per-day growth of uncertainty while a team isn't playing. Over a ~150 day
+# offseason this takes a settled RD of 50 back up to about 100.
+RD_PER_DAY = 7.0
+
+def _g(rd):
+    return 1 / math.sqrt(1 + 3 * Q ** 2 * rd ** 2 / math.pi ** 2)
+
+class GlickoEngine:
+    # Glicko rating engine, a drop-in for elo.rate_games in run_pipeline.
+    # Ratings live in the same current_elos dict as Elo; the deviation (RD)
+    # of every team is kept here in a NumPy array so that time-based
+    # inflation is applied to all teams at once.
+
+    def __init__(self, teams=(), initial_rd=SEASON_START_RD, rd_per_day=RD_PER_DAY, max_rd=MAX_RD):
+        self.teams = list(teams)
+        self.index = {team: i for i, team in enumerate(self.teams)}
+        self.rd = np.full(len(self.teams), float(initial_rd))
+        self.rd_per_day = rd_per_day
+        self.max_rd = max_rd
+        self.day = None
+
+    def inflate(self, days):
+        # Uncertainty grows with time off; after a long layoff or an offseason
+        # a team's next results move its rating more
+        if days > 0:
+            self.rd = np.minimum(np.sqrt(self.rd ** 2 + days * self.rd_per_day ** 2), self.max_rd)
+
+    def new_season(self, rd=SEASON_START_RD):
+        # Widen every team to at least `rd` to account for trades and free agency
+        self.rd = np.maximum(self.rd, rd)
+
+    def add_team(self, team, rd=None):
+        # Teams the engine hasn't seen yet (e.g. expansion teams in a backfill)
+        # start with the most uncertainty there is
+        self.index[team] = len(self.teams)
+        self.teams.append(team)
+        self.rd = np.append(self.rd, self.max_rd if rd is None else rd)
+
+    def rd_of(self, team):
+        return float(self.rd[self.index[team]])
+
+    def __call__(self, games, current_elos):
+        for game in games:
+            day = parse_date(game.date)
+            if self.day is not None:
+                self.inflate(day - self.day)
+            self.day = day
+
+            for team in (game.home, game.away):
+                if team not in self.index:
+                    self.add_team(team)
+            home_i = self.index[game.home]
+            away_i = self.index[game.away]
+            home_r, away_r = current_elos[game.home], current_elos[game.away]
+            home_rd, away_rd = float(self.rd[home_i]), float(self.rd[away_i])
+
+            result = 1 if game.home_pts > game.away_pts else 0
+            new_home_r, new_home_rd = self._update(home_r, home_rd, away_r, away_rd, result)
+            new_away_r, new_away_rd = self._update(away_r, away_rd, home_r, home_rd, 1 - result)
+
+            current_elos[game.home] = new_home_r
+            current_elos[game.away] = new_away_r
+            self.rd[home_i] = new_home_rd
+            self.rd[away_i] = new_away_rd
+
+            yield RatedGame(game, home_r, away_r, new_home_r, new_away_r, new_home_rd, new_away_rd)
+
+    @staticmethod
+    def _update(rating, rd, opp_rating, opp_rd, actual):
+        g = _g(opp_rd)
+        expected = 1 / (1 + 10 ** (-g * (rating - opp_rating) / 400))
+        d2_inv = Q ** 2 * g ** 2 * expected * (1 - expected)
+        precision = 1 / rd ** 2 + d2_inv
+        return rating + Q / precision * g * (actual - expected), math.sqrt(1 / precision)
@@ -0,0 +1,232 @@
+import copy
+import os
+import pickle
+import threading
+from functools import partial
+
+from elo import rate_games
+from pipeline import SCHEDULE_SCHEMA, data_version, games_from_csv, history_sink, run_pipeline
+from teams import CONFERENCES, TEAM_COLORS, TEAM_ABBRS
+
+# Months of the NBA regular season, each with its own schedule page
+MONTHS = ['october','november','december','january','february','march','april']
+
+DEFAULT_COLOR = 'rgb(128,128,128)'
+INITIAL_ELO = 1500
+
+def month_url(month, season=2025):
+    return f"https://www.basketball-reference.com/leagues/NBA_{season}_games-{month}.html"
+
+# League configs. Each one describes everything that used to be hardcoded
+# for the NBA: the teams and how to draw them, how long a season is, how
+# its schedule file is laid out and where its pages come from. `teams` can
+# be None for leagues whose teams are picked up from the schedule itself.
+LEAGUES = {
+    'NBA': {
+        'name': 'NBA',
+        'teams': list(TEAM_ABBRS),
+        'conferences': CONFERENCES,
+        'colors': TEAM_COLORS,
+        'abbrs': TEAM_ABBRS,
+        'season_games': 82,
+        # Seasons that were cut short, with the fewest games any team played
+        'short_seasons': {1999: 50, 2012: 66, 2020: 64, 2021: 72},
+        # Most games a team can show up in on the schedule pages: the NBA Cup
+        # final, two play-in games and four best-of-seven rounds on top of 82
+        'max_games': 113,
+        'k': 20,
+        'schedule_schema': SCHEDULE_SCHEMA,
+        'schedule_path': '2025_schedule.csv',
+        'initial_elos': '2023-24/final_elos.pkl',
+        'source': lambda season: [month_url(month, season) for month in MONTHS]
+    },
+    'WNBA': {
+        'name': 'WNBA',
+        'teams': [
+            'Atlanta Dream', 'Chicago Sky', 'Connecticut Sun', 'Indiana Fever',
+            'New York Liberty', 'Washington Mystics', 'Dallas Wings', 'Golden State Valkyries',
+            'Las Vegas Aces', 'Los Angeles Sparks', 'Minnesota Lynx', 'Phoenix Mercury', 'Seattle Storm'
+        ],
+        'conferences': {
+            'Eastern': [
+                'Atlanta Dream', 'Chicago Sky', 'Connecticut Sun', 'Indiana Fever',
+                'New York Liberty', 'Washington Mystics'
+            ],
+            'Western': [
+                'Dallas Wings', 'Golden State Valkyries', 'Las Vegas Aces', 'Los Angeles Sparks',
+                'Minnesota Lynx', 'Phoenix Mercury', 'Seattle Storm'
+            ]
+        },
+        'colors': {
+            'Atlanta Dream': 'rgb(200,16,46)',
+            'Chicago Sky': 'rgb(65,143,222)',
+            'Connecticut Sun': 'rgb(242,102,34)',
+            'Indiana Fever': 'rgb(0,45,98)',
+            'New York Liberty': 'rgb(134,206,188)',
+            'Washington Mystics': 'rgb(225,58,62)',
+            'Dallas Wings': 'rgb(0,45,135)',
+            'Golden State Valkyries': 'rgb(99,44,146)',
+            'Las Vegas Aces': 'rgb(166,25,46)',
+            'Los Angeles Sparks': 'rgb(85,37,130)',
+            'Minnesota Lynx': 'rgb(35,97,146)',
+            'Phoenix Mercury': 'rgb(203,96,21)',
+            'Seattle Storm': 'rgb(44,82,52)'
+        },
+        'abbrs': {
+            'Atlanta Dream': 'ATL',
+            'Chicago Sky': 'CHI',
+            'Connecticut Sun': 'CON',
+            'Indiana Fever': 'IND',
+            'New York Liberty': 'NYL',
+            'Washington Mystics': 'WAS',
+            'Dallas Wings': 'DAL',
+            'Golden State Valkyries': 'GSV',
+            'Las Vegas Aces': 'LVA',
+            'Los Angeles Sparks': 'LAS',
+            'Minnesota Lynx': 'MIN',
+            'Phoenix Mercury': 'PHO',
+            'Seattle Storm': 'SEA'
+        },
+        'season_games': 44,
+        # The season has grown from 28 games in 1997
+        'short_seasons': {
+            1997: 28, 1998: 30, **{season: 32 for season in range(1999, 2003)},
+            **{season: 34 for season in range(2003, 2020)}, 2020: 22, 2021: 32, 2022: 36, 2023: 40, 2024: 40
+        },
+        'max_games': 60,
+        'k': 20,
+        'schedule_schema': SCHEDULE_SCHEMA,
+        'schedule_path': 'wnba_schedule.csv',
+        'initial_elos': None,
+        # The whole WNBA season is on a single page
+        'source': lambda season: [f"https://www.basketball-reference.com/wnba/years/{season}_games.html"]
+    },
+    'G League': {
+        'name': 'G League',
+        # Affiliates come and go too often to keep a list; teams are taken from the schedule
+        'teams': None,
+        'conferences': {},
+        'colors': {},
+        'abbrs': {},
+        'season_games': 50,
+        'short_seasons': {},
+        'max_games': 56,
+        'k': 20,
+        'schedule_schema': SCHEDULE_SCHEMA,
+        'schedule_path': 'gleague_schedule.csv',
+        'initial_elos': None,
+        # No basketball-reference pages, so the schedule has to be supplied locally
+        'source': None
+    }
+}
+
+def season_length(config, season):
+    # Regular-season games every team plays in `season`
+    return config['short_seasons'].get(season, config['season_games'])
+
+class League:
+    # Ratings and caches for one league. The engine takes (games, current_elos)
+    # like everywhere else in the pipeline; by default it's elo.rate_games with
+    # the league's K. Nothing is shared between leagues.
+    # A League can be shared between threads (the app serves every session
+    # from one): new ratings are built aside and swapped in under the lock,
+    # and cached() holds the same lock.
+
+    def __init__(self, config, engine=None):
+        self.config = config
+        self.name = config['name']
+        self.engine = engine if engine is not None else partial(rate_games, k=config['k'])
+        self.lock = threading.RLock()
+        self.colors = dict(config['colors'])
+        self.abbrs = dict(config['abbrs'])
+        self.version = None
+        self.cache = {}
+        self.current_elos = {}
+        self.elo_histories = {}
+
+    def initial_elos(self):
+        path = self.config['initial_elos']
+        if path is not None and os.path.exists(path):
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        return {team: INITIAL_ELO for team in self.config['teams'] or []}
+
+    def load(self, games=None):
+        # Rates the league from scratch, from its schedule file unless games are given
+        current_elos, elo_histories = {}, {}
+        colors, abbrs = dict(self.config['colors']), dict(self.config['abbrs'])
+
+        def add_team(team, rating=INITIAL_ELO):
+            current_elos[team] = rating
+            elo_histories[team] = [rating]
+            colors.setdefault(team, DEFAULT_COLOR)
+            abbrs.setdefault(team, team)
+
+        def register(games):
+            # Gives teams that only show up in the schedule a starting rating as they stream past
+            for game in games:
+                for team in (game.home, game.away):
+                    if team not in current_elos:
+                        add_team(team)
+                yield game
+
+        for team, rating in self.initial_elos().items():
+            add_team(team, rating)
+        if games is None:
+            games = games_from_csv(self.config['schedule_path'], self.config['schedule_schema'])
+
+        # Stateful engines (glicko.GlickoEngine) start every load from their initial state
+        engine = copy.deepcopy(self.engine)
+        run_pipeline(register(games), current_elos, sinks=[history_sink(elo_histories)], engine=engine)
+
+        with self.lock:
+            self.current_elos, self.elo_histories = current_elos, elo_histories
+            self.colors, self.abbrs = colors, abbrs
+            self.cache = {}
+        return self
+
+    def refresh(self):
+        # Reloads only if the league's schedule file has changed. Held under
+        # the lock throughout, so concurrent callers wait for one reload.
+        with self.lock:
+            version = data_version(self.config['schedule_path'])
+            if version != self.version:
+                self.load()
+                self.version = version
+        return self
+
+    def ratings(self):
+        # Current ratings and histories from the same load
+        with self.lock:
+            return self.current_elos, self.elo_histories
+
+    def cached(self, key, compute):
+        # Per-league memo, emptied whenever the league is re-rated
+        with self.lock:
+            if key not in self.cache:
+                self.cache[key] = compute()
+            return self.cache[key]
+
+class LeagueHost:
+    # Hosts any number of leagues side by side in one process
+
+    def __init__(self):
+        self.leagues = {}
+
+    def add(self, config, engine=None):
+        league = League(config, engine)
+        self.leagues[league.name] = league
+        return league
+
+    def available(self, configs=LEAGUES):
+        # Adds every configured league that has a schedule file on disk
+        for name, config in configs.items():
+            if name not in self.leagues and os.path.exists(config['schedule_path']):
+                self.add(config).refresh()
+        return list(self.leagues)
+
+    def __getitem__(self, name):
+        return self.leagues[name]
+
+    def __contains__(self, name):
+        return name in self.leagues
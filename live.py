@@ -0,0 +1,208 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from statistics import NormalDist
+
+from elo import expected_score, update_elo
+from leagues import LEAGUES, League
+
+# Standard deviation of the final home margin over a full game, in points
+MARGIN_SD = 13.0
+# Regulation length in seconds
+GAME_SECONDS = 48 * 60
+
+# One snapshot per league, e.g. live_snapshot_nba.json
+SNAPSHOT_PATH = 'live_snapshot_{}.json'
+# Snapshots older than this are treated as empty by the app
+SNAPSHOT_MAX_AGE = 6 * 60 * 60
+# How long a finished game stays in the snapshot after its final update
+FINISHED_GRACE = 15 * 60
+
+_normal = NormalDist()
+
+def live_win_probability(pregame_prob, margin, seconds_remaining):
+    # The pre-game expected_score is turned into an expected final margin,
+    # of which only the part for the time left still applies. What remains
+    # of the game is modelled as a normal random walk on the score margin.
+    if seconds_remaining <= 0:
+        if margin == 0:
+            return 0.5
+        return 1.0 if margin > 0 else 0.0
+
+    pregame_prob = min(max(pregame_prob, 1e-6), 1 - 1e-6)
+    pregame_margin = MARGIN_SD * _normal.inv_cdf(pregame_prob)
+
+    remaining = min(seconds_remaining / GAME_SECONDS, 1.0)
+    mean = margin + pregame_margin * remaining
+    sd = MARGIN_SD * remaining ** 0.5
+    return _normal.cdf(mean / sd)
+
+def snapshot_path(league):
+    return SNAPSHOT_PATH.format(league.lower().replace(' ', '_'))
+
+def load_current_elos(league='NBA'):
+    # Ratings going into tonight's games, from the league's starting ratings and schedule file
+    return League(LEAGUES[league]).load().current_elos
+
+class LiveTracker:
+    # Keeps the latest state of every game in progress and writes a snapshot
+    # for the dashboard to pick up
+
+    def __init__(self, current_elos, snapshot_path=snapshot_path('NBA'), snapshot_interval=1.0, k=20):
+        self.current_elos = current_elos
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.k = k
+        self.games = {}
+        # Only the most recent latencies are kept, so a long-running tracker stays bounded
+        self.latencies = deque(maxlen=10000)
+        self.updates = 0
+        self._last_snapshot = 0.0
+
+    def apply(self, update):
+        start = time.perf_counter()
+
+        home, away = update['home'], update['away']
+        if home not in self.current_elos or away not in self.current_elos:
+            print(f"Skipping update for unknown teams: {away} @ {home}")
+            return None
+
+        home_elo = self.current_elos[home]
+        away_elo = self.current_elos[away]
+        pregame_prob = expected_score(home_elo, away_elo)
+
+        margin = int(update['home_pts']) - int(update['away_pts'])
+        seconds_remaining = float(update['seconds_remaining'])
+        win_prob = live_win_probability(pregame_prob, margin, seconds_remaining)
+
+        # Provisional deltas are the rating change the current win probability
+        # is worth; they converge to the real update once the game is final
+        home_delta = update_elo(home_elo, pregame_prob, win_prob, self.k) - home_elo
+        away_delta = update_elo(away_elo, 1 - pregame_prob, 1 - win_prob, self.k) - away_elo
+
+        game_id = update.get('game_id', f"{away}@{home}")
+        state = {
+            'game_id': game_id,
+            'home': home,
+            'away': away,
+            'home_pts': int(update['home_pts']),
+            'away_pts': int(update['away_pts']),
+            'seconds_remaining': seconds_remaining,
+            'pregame_prob': pregame_prob,
+            'home_win_prob': win_prob,
+            'home_delta': home_delta,
+            'away_delta': away_delta,
+            'updated': time.time()
+        }
+        self.games[game_id] = state
+
+        self.latencies.append(time.perf_counter() - start)
+        self.updates += 1
+        return state
+
+    def write_snapshot(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_snapshot < self.snapshot_interval:
+            return
+        self._last_snapshot = now
+
+        # Finished games drop off once they've been final for a while
+        cutoff = time.time() - FINISHED_GRACE
+        self.games = {
+            game_id: state for game_id, state in self.games.items()
+            if state['seconds_remaining'] > 0 or state['updated'] >= cutoff
+        }
+
+        # Write to a temporary file first so the app never reads half a snapshot
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'updated': time.time(), 'games': list(self.games.values())}, f)
+        os.replace(tmp_path, self.snapshot_path)
+
+    async def run(self, feed):
+        async for update in feed:
+            if self.apply(update) is not None:
+                self.write_snapshot()
+        self.write_snapshot(force=True)
+
+# Feeds - async iterators of score updates, one JSON object per line
+
+async def file_feed(path, speed=None):
+    # Replays a recorded feed. With speed set, updates carrying a 't' offset
+    # (seconds since the start of the recording) are spaced out in real time,
+    # `speed` times faster than recorded.
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            update = json.loads(line)
+            if speed and 't' in update:
+                delay = start + update['t'] / speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield update
+
+async def socket_feed(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while line := await reader.readline():
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+async def serve_replay(path, host='127.0.0.1', port=9000, speed=None):
+    # Stand-in for a real score provider: streams a recorded feed to every client
+    async def handle(reader, writer):
+        async for update in file_feed(path, speed):
+            writer.write((json.dumps(update) + '\n').encode())
+            await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+
+    server = await asyncio.start_server(handle, host, port)
+    async with server:
+        await server.serve_forever()
+
+async def main(args):
+    if args.serve:
+        await serve_replay(args.serve, args.host, args.port, args.speed)
+        return
+
+    try:
+        current_elos = load_current_elos(args.league)
+    except FileNotFoundError as e:
+        raise SystemExit(f"Could not load the {args.league} ratings: {e}")
+    tracker = LiveTracker(current_elos, snapshot_path(args.league), args.snapshot_interval, LEAGUES[args.league]['k'])
+    if args.file:
+        feeds = [file_feed(path, args.speed) for path in args.file]
+    else:
+        feeds = [socket_feed(args.host, args.port)]
+
+    # Several feeds can share one tracker; every update is handled on the event loop
+    await asyncio.gather(*(tracker.run(feed) for feed in feeds))
+
+    if tracker.latencies:
+        latencies = sorted(tracker.latencies)
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000
+        print(f"{tracker.updates} updates across {len(tracker.games)} games, p50 {p50:.3f} ms, p99 {p99:.3f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live in-game win probabilities from a score feed")
+    parser.add_argument('--league', default='NBA', choices=list(LEAGUES))
+    parser.add_argument('--file', nargs='+', help="replay one or more recorded JSON-lines feeds")
+    parser.add_argument('--serve', help="serve a recorded feed over TCP instead of tracking it")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--speed', type=float, help="replay speed multiplier for recorded feeds")
+    parser.add_argument('--snapshot-interval', type=float, default=1.0, help="minimum seconds between dashboard snapshots")
+    asyncio.run(main(parser.parse_args()))
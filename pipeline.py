@@ -0,0 +1,105 @@
+import csv
+import hashlib
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+from elo import rate_games
+
+# Columns of the basketball-reference schedule table, as written to 2025_schedule.csv
+SCHEDULE_COLUMNS = [
+    'Date',
+    'Start (ET)',
+    'Visitor/Neutral',
+    'away_pts',
+    'Home/Neutral',
+    'home_pts',
+    'Box Score',
+    'OT',
+    'Attend.',
+    'LOG',
+    'Arena',
+    'Notes'
+]
+
+# Which schedule column holds each Game field. Leagues whose schedules are
+# laid out differently pass their own schema (see leagues.py).
+SCHEDULE_SCHEMA = {
+    'date': 'Date',
+    'away': 'Visitor/Neutral',
+    'away_pts': 'away_pts',
+    'home': 'Home/Neutral',
+    'home_pts': 'home_pts'
+}
+
+Game = namedtuple('Game', ['date', 'away', 'away_pts', 'home', 'home_pts'])
+
+def game_from_row(row, schema=SCHEDULE_SCHEMA):
+    # row is a dict keyed by schedule columns; returns None for games without a final score
+    if not row.get(schema['away_pts']) or not row.get(schema['home_pts']):
+        return None
+    return Game(
+        date=row[schema['date']],
+        away=row[schema['away']],
+        away_pts=int(row[schema['away_pts']]),
+        home=row[schema['home']],
+        home_pts=int(row[schema['home_pts']])
+    )
+
+@lru_cache(maxsize=None)
+def parse_date(date):
+    # basketball-reference dates, e.g. 'Tue, Oct 22, 2024', as day ordinals
+    return datetime.strptime(date, '%a, %b %d, %Y').toordinal()
+
+# Sources - each yields Game records one at a time
+
+def games_from_rows(rows, schema=SCHEDULE_SCHEMA):
+    # Scraped rows (lists in SCHEDULE_COLUMNS order), e.g. from scraper.parse_schedule_page()
+    for values in rows:
+        game = game_from_row(dict(zip(SCHEDULE_COLUMNS, values)), schema)
+        if game is not None:
+            yield game
+
+def games_from_csv(path, schema=SCHEDULE_SCHEMA):
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            game = game_from_row(row, schema)
+            if game is not None:
+                yield game
+
+def unplayed_games_from_csv(path, schema=SCHEDULE_SCHEMA):
+    # Scheduled games that don't have a final score yet, with None for the points
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            if not row.get(schema['away_pts']) or not row.get(schema['home_pts']):
+                yield Game(row[schema['date']], row[schema['away']], None, row[schema['home']], None)
+
+def data_version(path):
+    # Content hash of a data file, used to key caches so they refresh when the data changes
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+# Sinks - callables that receive every RatedGame
+
+def history_sink(elo_histories):
+    def sink(rated):
+        elo_histories[rated.game.home].append(rated.home_after)
+        elo_histories[rated.game.away].append(rated.away_after)
+    return sink
+
+def rd_sink(rd_histories):
+    # For engines that report rating deviation, e.g. glicko.GlickoEngine
+    def sink(rated):
+        rd_histories[rated.game.home].append(rated.home_rd)
+        rd_histories[rated.game.away].append(rated.away_rd)
+    return sink
+
+def run_pipeline(games, current_elos, sinks=(), engine=rate_games):
+    # Pulls games through the rating engine and fans each result out to the
+    # sinks. Nothing is materialized, so memory only depends on what the sinks keep.
+    count = 0
+    for rated in engine(games, current_elos):
+        for sink in sinks:
+            sink(rated)
+        count += 1
+    return count
@@ -0,0 +1,251 @@
+import plotly.graph_objects as go
+
+from teams import TEAM_COLORS, TEAM_ABBRS
+
+# Every plot takes the team colors and abbreviations of the league being
+# shown (see leagues.py), defaulting to the NBA's
+
+def elo_bar_plot(current_elos, colors=TEAM_COLORS):
+    TEAM_NAMES = list(current_elos.keys())
+    x = TEAM_NAMES
+    y = [current_elos[i] for i in TEAM_NAMES]
+    bar_colors = [colors[i] for i in TEAM_NAMES]
+
+    sorted_indices = sorted(range(len(TEAM_NAMES)), key=lambda i: current_elos[TEAM_NAMES[i]])
+    sorted_x = [TEAM_NAMES[i] for i in sorted_indices]
+    sorted_y = [current_elos[TEAM_NAMES[i]] for i in sorted_indices]
+    sorted_bar_colors = [colors[TEAM_NAMES[i]] for i in sorted_indices]
+
+    fig = go.Figure(data=[go.Bar(
+        x=sorted_x,
+        y=sorted_y,
+        marker_color=sorted_bar_colors
+    )])
+
+    fig.update_layout(
+        height=600,
+        plot_bgcolor='white',
+        yaxis=dict(
+            range=[1000, None]
+        )
+    )
+
+    fig.update_xaxes(
+        mirror=True,
+        ticks='outside',
+        showline=True,
+        linecolor='black',
+        gridcolor='lightgrey'
+    )
+    fig.update_yaxes(
+        mirror=True,
+        ticks='outside',
+        showline=True,
+        linecolor='black',
+        gridcolor='lightgrey',
+        autorange=False,
+        range=[sorted_y[0]+-100, sorted_y[-1] + 50]
+    )
+
+    return fig
+
+def elo_line_plot(elo_histories, focused_teams=None, bands=None, colors=TEAM_COLORS, abbrs=TEAM_ABBRS, league='NBA'):
+    # bands optionally maps teams to their rating deviation after each game;
+    # focused teams then get a shaded +/- 2 RD confidence band. Each line runs
+    # for as many games as its team has played, from game 0 (before the season).
+    fig = go.Figure()
+    
+    # Convert focused_teams to list if it's None
+    if focused_teams is None:
+        focused_teams = ['Golden State Warriors'] # go dubs
+    
+    # Add teams with enhanced styling
+    for team, elo in elo_histories.items():
+        games = list(range(len(elo)))
+
+        # Determine line styling based on whether this is a focused team
+        if team in focused_teams:
+            line_width = 4
+            opacity = 1.0
+        else:
+            line_width = 1
+            opacity = 0.2
+        
+        if bands is not None and team in focused_teams and team in bands:
+            upper = [r + 2 * rd for r, rd in zip(elo, bands[team])]
+            lower = [r - 2 * rd for r, rd in zip(elo, bands[team])]
+            fig.add_trace(go.Scatter(
+                x=games[:len(upper)] + games[:len(upper)][::-1],
+                y=upper + lower[::-1],
+                fill='toself',
+                fillcolor=colors[team].replace('rgb', 'rgba').replace(')', ',0.15)'),
+                line=dict(width=0),
+                hoverinfo='skip',
+                showlegend=False
+            ))
+
+        # Add the line trace
+        fig.add_trace(go.Scatter(
+            x=games,
+            y=elo,
+            mode='lines',
+            name=abbrs[team],
+            line=dict(
+                color=colors[team],
+                width=line_width
+            ),
+            opacity=opacity,
+            hovertemplate=f"{team}<br>Game: %{{x}}<br>Elo: %{{y}}<extra></extra>"
+        ))
+        
+        # Add end-of-line labels
+        if team in focused_teams or not focused_teams:
+            fig.add_annotation(
+                x=games[-1],
+                y=elo[-1],
+                text=abbrs[team],
+                xanchor='left',
+                yanchor='middle',
+                xshift=5,
+                showarrow=False,
+                font=dict(
+                    size=10,
+                    color=colors[team]
+                ),
+                opacity=opacity
+            )
+
+    fig.update_layout(
+        title=dict(
+            text=f'{league} Team Elo Ratings Throughout Season',
+            x=0.5,
+            y=0.95,
+            xanchor='center',
+            yanchor='top',
+            font=dict(size=24)
+        ),
+        height=600,
+        plot_bgcolor='white',
+        showlegend=False,
+        margin=dict(r=100),
+        xaxis_title="Games Played",
+        yaxis_title="Elo Rating",
+        hovermode='closest'
+    )
+    
+    fig.update_xaxes(
+        mirror=True,
+        ticks='outside',
+        showline=True,
+        linecolor='black',
+        gridcolor='lightgrey',
+        zeroline=False,
+        tickmode='linear',
+        tick0=0,
+        dtick=10
+    )
+    
+    fig.update_yaxes(
+        mirror=True,
+        ticks='outside',
+        showline=True,
+        linecolor='black',
+        gridcolor='lightgrey',
+        zeroline=False,
+        tickformat='.0f'
+    )
+    
+    return fig
+
+def elo_delta_plot(deltas, colors=TEAM_COLORS, abbrs=TEAM_ABBRS):
+    sorted_teams = sorted(deltas.keys(), key=lambda x: deltas[x])
+    x = [abbrs[team] for team in sorted_teams]
+    y = [deltas[team] for team in sorted_teams]
+    bar_colors = [colors[team] for team in sorted_teams]
+    
+    fig = go.Figure(data=[go.Bar(
+        x=x,
+        y=y,
+        marker_color=bar_colors
+    )])
+    
+    max_delta = max(y)
+    min_delta = min(y)
+    padding = (max_delta - min_delta) * 0.1
+    
+    fig.update_layout(
+        height=600,
+        plot_bgcolor='white',
+        showlegend=False,
+        shapes=[dict(
+            type='line',
+            x0=-0.5,
+            x1=len(x) - 0.5,
+            y0=0,
+            y1=0,
+            line=dict(
+                color='black',
+                width=1
+            )
+        )]
+    )
+    
+    fig.update_xaxes(
+        tickangle=45,
+        mirror=True,
+        ticks='outside',
+        showline=True,
+        linecolor='black',
+        gridcolor='lightgrey'
+    )
+    
+    fig.update_yaxes(
+        mirror=True,
+        ticks='outside',
+        showline=True,
+        linecolor='black',
+        gridcolor='lightgrey',
+        range=[min_delta - padding, max_delta + padding]
+    )
+    
+    return fig
+
+def sos_bar_plot(summary, colors=TEAM_COLORS, abbrs=TEAM_ABBRS):
+    sorted_summary = summary.sort_values('sos')
+    x = [abbrs[team] for team in sorted_summary.index]
+    y = sorted_summary['sos'].tolist()
+    bar_colors = [colors[team] for team in sorted_summary.index]
+
+    fig = go.Figure(data=[go.Bar(
+        x=x,
+        y=y,
+        marker_color=bar_colors,
+        hovertemplate="%{x}<br>Mean opponent Elo: %{y:.1f}<extra></extra>"
+    )])
+
+    fig.update_layout(
+        height=600,
+        plot_bgcolor='white',
+        showlegend=False,
+        yaxis_title="Mean Opponent Pre-Game Elo"
+    )
+
+    fig.update_xaxes(
+        tickangle=45,
+        mirror=True,
+        ticks='outside',
+        showline=True,
+        linecolor='black',
+        gridcolor='lightgrey'
+    )
+    fig.update_yaxes(
+        mirror=True,
+        ticks='outside',
+        showline=True,
+        linecolor='black',
+        gridcolor='lightgrey',
+        autorange=False,
+        range=[min(y) - 20, max(y) + 20]
+    )
+
+    return fig
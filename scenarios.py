@@ -0,0 +1,129 @@
+import numpy as np
+
+from elo import expected_score, update_elo
+
+class SeasonReplay:
+    # A season rated once and kept as arrays, so that what-if scenarios can
+    # restart from a stored snapshot instead of replaying every game.
+    # Nothing here is modified after construction; scenarios only read it.
+
+    def __init__(self, games, initial_elos, k=20, snapshot_every=25):
+        self.games = list(games)
+        self.teams = list(initial_elos)
+        self.index = {team: i for i, team in enumerate(self.teams)}
+        self.k = k
+        self.snapshot_every = snapshot_every
+
+        self.home_idx = np.array([self.index[g.home] for g in self.games], dtype=np.intp)
+        self.away_idx = np.array([self.index[g.away] for g in self.games], dtype=np.intp)
+        self.home_won = np.array([g.home_pts > g.away_pts for g in self.games], dtype=bool)
+        self.initial = np.array([initial_elos[team] for team in self.teams], dtype=float)
+
+        # snapshots[i] holds every rating before game i * snapshot_every
+        home_after, away_after, final, snapshots = replay(
+            self.initial, self.home_idx, self.away_idx, self.home_won, 0, k, snapshot_every
+        )
+        self.home_after = home_after
+        self.away_after = away_after
+        self.final = final
+        self.snapshots = snapshots
+        for array in (self.home_idx, self.away_idx, self.home_won, self.initial,
+                      self.home_after, self.away_after, self.final, self.snapshots):
+            array.flags.writeable = False
+
+    def scenario(self, overrides):
+        # overrides maps game indices to whether the home team should have won
+        return Scenario(self, overrides)
+
+    def team_games(self, team):
+        # Indices of every game a team played, in order
+        i = self.index[team]
+        return np.flatnonzero((self.home_idx == i) | (self.away_idx == i))
+
+    def histories(self):
+        return _histories(self, self.home_after, self.away_after)
+
+class Scenario:
+    # Re-rates a season with some results changed. Games before the nearest
+    # snapshot preceding the first edit are untouched, so their ratings are
+    # read straight from the base replay and only the suffix is recomputed.
+
+    def __init__(self, base, overrides):
+        self.base = base
+        self.overrides = {int(i): bool(won) for i, won in overrides.items()}
+
+        if not self.overrides:
+            self.start = len(base.games)
+            self.home_after = base.home_after
+            self.away_after = base.away_after
+            self.final = base.final
+            return
+
+        snapshot = min(self.overrides) // base.snapshot_every
+        self.start = snapshot * base.snapshot_every
+
+        home_won = base.home_won[self.start:].copy()
+        for i, won in self.overrides.items():
+            home_won[i - self.start] = won
+
+        suffix_home, suffix_away, self.final, _ = replay(
+            base.snapshots[snapshot], base.home_idx[self.start:], base.away_idx[self.start:],
+            home_won, self.start, base.k, None
+        )
+        # Copy-on-write: the prefix is a view of the base arrays and only
+        # gets copied if the full arrays are asked for
+        self.home_after = _Spliced(base.home_after[:self.start], suffix_home)
+        self.away_after = _Spliced(base.away_after[:self.start], suffix_away)
+
+    def final_elos(self):
+        return dict(zip(self.base.teams, self.final.tolist()))
+
+    def deltas(self):
+        # Change in every team's final rating against what actually happened
+        return dict(zip(self.base.teams, (self.final - self.base.final).tolist()))
+
+    def histories(self):
+        return _histories(self.base, np.asarray(self.home_after), np.asarray(self.away_after))
+
+class _Spliced:
+    # A shared prefix and a scenario-owned suffix that look like one array
+    def __init__(self, prefix, suffix):
+        self.prefix = prefix
+        self.suffix = suffix
+
+    def __len__(self):
+        return len(self.prefix) + len(self.suffix)
+
+    def __array__(self, dtype=None, copy=None):
+        return np.concatenate((self.prefix, self.suffix)).astype(dtype or float, copy=False)
+
+def replay(ratings, home_idx, away_idx, home_won, offset, k, snapshot_every):
+    # The same update as elo.rate_games, run over index arrays. Plain Python
+    # floats are used inside the loop since the per-game work is two scalars.
+    ratings = ratings.tolist()
+    n = len(home_idx)
+    home_after = np.empty(n)
+    away_after = np.empty(n)
+    snapshots = []
+
+    for j, (h, a, won) in enumerate(zip(home_idx.tolist(), away_idx.tolist(), home_won.tolist())):
+        if snapshot_every and (offset + j) % snapshot_every == 0:
+            snapshots.append(list(ratings))
+        home_elo, away_elo = ratings[h], ratings[a]
+        result = 1 if won else 0
+        ratings[h] = update_elo(home_elo, expected_score(home_elo, away_elo), result, k)
+        ratings[a] = update_elo(away_elo, expected_score(away_elo, home_elo), 1 - result, k)
+        home_after[j] = ratings[h]
+        away_after[j] = ratings[a]
+
+    if snapshot_every and (offset + n) % snapshot_every == 0:
+        snapshots.append(list(ratings))
+    return home_after, away_after, np.array(ratings), np.array(snapshots).reshape(-1, len(ratings))
+
+def _histories(base, home_after, away_after):
+    # Same shape as the app's elo_histories: starting rating then one entry per game
+    histories = {team: [base.initial[i]] for i, team in enumerate(base.teams)}
+    for team, i in base.index.items():
+        games = base.team_games(team)
+        histories[team].extend(np.where(base.home_idx[games] == i, home_after[games], away_after[games]).tolist())
+    return histories
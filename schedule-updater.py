@@ -1,86 +1,163 @@
-from datetime import datetime
-import pandas as pd
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
 import time
-import requests
-from bs4 import BeautifulSoup
+from collections import Counter
 
-def get_schedule():
+from pipeline import SCHEDULE_COLUMNS, games_from_rows
+from leagues import LEAGUES, League
+from scraper import fetch_page, parse_schedule_page, replay_schedule
+from validation import validate_schedule
 
-    months = ['october','november','december','january','february','march','april']
-    current_month = datetime.now().strftime("%B").lower()
-    
-    schedule = pd.DataFrame()
+CHECKPOINT_DIR = '.update_checkpoints'
+# Finished pages are still refetched after this long (seconds), to pick up late corrections
+CHECKPOINT_MAX_AGE = 7 * 24 * 60 * 60
+# The season the leagues' schedule files hold; other seasons need an explicit --out
+CURRENT_SEASON = 2025
 
-    for month in months:
-        url = f"https://www.basketball-reference.com/leagues/NBA_2025_games-{month}.html"
+class UpdateError(Exception):
+    pass
 
-        # Add headers to mimic a browser request
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+# Checkpoints - the parsed rows of every page fetched so far, so a failed
+# run can pick up where it left off and finished months aren't fetched again
 
+def _checkpoint_path(url, league, season):
+    name = hashlib.sha1(url.encode()).hexdigest()[:16]
+    return os.path.join(CHECKPOINT_DIR, f"{league}-{season}".replace(' ', '_'), f"{name}.json")
+
+def load_checkpoint(url, league, season):
+    try:
+        with open(_checkpoint_path(url, league, season)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def save_checkpoint(url, league, season, rows):
+    path = _checkpoint_path(url, league, season)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'url': url, 'rows': rows, 'fetched': time.time()}, f)
+    os.replace(tmp_path, path)
+
+def is_final(rows):
+    # Once every game on a page has a score, the page won't change again
+    away_pts = SCHEDULE_COLUMNS.index('away_pts')
+    return bool(rows) and all(row[away_pts] != '' for row in rows)
+
+def is_reusable(checkpoint, last_page):
+    # The season's last page can always gain games, so it's never reused;
+    # earlier pages are reused while they're finished and recent
+    if checkpoint is None or last_page:
+        return False
+    fetched = checkpoint.get('fetched')
+    if not isinstance(fetched, (int, float)) or time.time() - fetched > CHECKPOINT_MAX_AGE:
+        return False
+    return is_final(checkpoint['rows'])
+
+def team_counts(rows):
+    away, home = SCHEDULE_COLUMNS.index('Visitor/Neutral'), SCHEDULE_COLUMNS.index('Home/Neutral')
+    return Counter(row[away] for row in rows) + Counter(row[home] for row in rows)
+
+def fetch_season(urls, league, season):
+    # A page that comes back empty, or a team with fewer games than the
+    # checkpoints held, means a page went missing or came back short.
+    # Fetched pages are checkpointed when a fetch fails, so the next run
+    # resumes from there, or once the season has passed those checks.
+    rows = []
+    fetched = {}
+    before = Counter()
+    try:
+        for n, url in enumerate(urls):
+            checkpoint = load_checkpoint(url, league, season)
+            if checkpoint is not None:
+                before += team_counts(checkpoint['rows'])
+            if is_reusable(checkpoint, last_page=n == len(urls) - 1):
+                print(f"Using checkpoint for {url}")
+                rows.extend(checkpoint['rows'])
+                continue
+
+            try:
+                page_rows = list(parse_schedule_page(fetch_page(url)))
+            except Exception as e:
+                raise UpdateError(f"Could not fetch {url}: {e}") from e
+            if not page_rows:
+                raise UpdateError(f"{url} came back without any games")
+            fetched[url] = page_rows
+            rows.extend(page_rows)
+    except UpdateError:
+        for url, page_rows in fetched.items():
+            save_checkpoint(url, league, season, page_rows)
+        raise
+
+    after = team_counts(rows)
+    lost = [f"{team} ({before[team]} -> {after[team]})" for team in sorted(before) if after[team] < before[team]]
+    if lost:
+        raise UpdateError(f"Teams have fewer games than last time, so a page came back short: {', '.join(lost)}")
+    for url, page_rows in fetched.items():
+        save_checkpoint(url, league, season, page_rows)
+    return rows
+
+def write_schedule(path, rows):
+    # Written to a temporary file and swapped in, so the old schedule stays
+    # in place unless the new one is complete
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(SCHEDULE_COLUMNS)
+        writer.writerows(rows)
+    os.replace(tmp_path, path)
+
+def get_schedule(path='2025_schedule.csv', season=2025, replay=False, workers=None, league='NBA'):
+    # Unplayed games are kept (with blank scores) for remaining strength of schedule.
+    # With replay=True the pages come from the local fixture archive instead of the network.
+    # Nothing is written unless every page was fetched and the result validates and rates.
+    start = time.perf_counter()
+    config = LEAGUES[league]
+    source = config['source']
+    if source is None:
+        raise UpdateError(f"The {league} has no schedule source to scrape; supply its schedule file directly")
+    if replay:
         try:
-            # Make the request with a slight delay to be respectful to the server
-            time.sleep(3)
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()  # Raise an exception for bad status codes
-            
-            # Parse the HTML content
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find the schedule table
-            table = soup.find('table', id='schedule')
-            
-            if table is None:
-                raise ValueError("Schedule table not found on the page")
-
-            # Define the columns we want to extract
-            columns = [
-                'Date',
-                'Start (ET)',
-                'Visitor/Neutral',
-                'away_pts',
-                'Home/Neutral',
-                'home_pts',
-                'Box Score',
-                'OT',
-                'Attend.',
-                'LOG',
-                'Arena',
-                'Notes'
-            ]
-            
-            # Extract rows
-            rows = []
-            for row in table.find_all('tr')[1:]:  # Skip header row
-                game_data = []
-                cells = row.find_all(['td', 'th'])
-                if cells:  # Only process rows with data
-                    for cell in cells:
-                        text = cell.text.strip()
-                        game_data.append(text)
-                    if game_data:  # Only append non-empty rows
-                        rows.append(game_data)
-            
-            # Create DataFrame with explicit column names
-            df = pd.DataFrame(rows, columns=columns)
-            df = df[df['away_pts'] != '']
-            schedule = pd.concat((schedule, df))
-            
-            if month == current_month:
-                break
-                
-
-
-
-        except requests.RequestException as e:
-            print(f"Error fetching the webpage: {e}")
-        except Exception as e:
-            print(f"Error processing the data: {e}")
-
-    # Optionally save to CSV
-    schedule.to_csv('2025_schedule.csv', index=False)
-    print("\nData has been saved to '2025_schedule.csv'")
-    return schedule
-
-schedule = get_schedule()
\ No newline at end of file
+            rows = list(replay_schedule(source(season), workers=workers))
+        except FileNotFoundError as e:
+            raise UpdateError(str(e)) from e
+    else:
+        rows = fetch_season(source(season), league, season)
+
+    problems = validate_schedule(rows, config, season)
+    if problems:
+        raise UpdateError("Schedule failed validation:\n" + "\n".join(f"  {problem}" for problem in problems))
+
+    # The validated rows go straight through the rating engine before anything is published
+    try:
+        ratings = League(config).load(games_from_rows(rows, config['schedule_schema'])).current_elos
+    except Exception as e:
+        raise UpdateError(f"Could not rate the new schedule: {e}") from e
+
+    write_schedule(path, rows)
+    if ratings:
+        leader = max(ratings, key=ratings.get)
+        print(f"{leader} leads the {league} at {ratings[leader]:.1f}")
+    print(f"\nData has been saved to '{path}' ({len(rows)} rows in {time.perf_counter() - start:.2f}s)")
+    return len(rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape a league schedule from basketball-reference")
+    parser.add_argument('--league', default='NBA', choices=list(LEAGUES))
+    parser.add_argument('--season', type=int, default=CURRENT_SEASON, help="season to fetch, named by the year it ends in")
+    parser.add_argument('--out', help="defaults to the league's schedule file; required for any other season")
+    parser.add_argument('--replay', action='store_true', help="rebuild from the local fixture archive without any network access")
+    parser.add_argument('--workers', type=int, help="processes used to parse pages when replaying")
+    args = parser.parse_args()
+    if args.out is None and args.season != CURRENT_SEASON:
+        parser.error(f"--out is required for seasons other than {CURRENT_SEASON}, so the current schedule isn't overwritten")
+    try:
+        get_schedule(args.out or LEAGUES[args.league]['schedule_path'], args.season, args.replay, args.workers, args.league)
+    except UpdateError as e:
+        # A non-zero exit stops the workflow before it commits anything
+        print(e)
+        sys.exit(1)
@@ -0,0 +1,102 @@
+from concurrent.futures import ProcessPoolExecutor
+import re
+import time
+import requests
+from bs4 import BeautifulSoup
+
+from fixtures import FIXTURE_DIR, load_index, load_object, store_page
+from leagues import MONTHS
+from pipeline import SCHEDULE_COLUMNS
+
+# Every month a season's pages can cover, in season order (for replaying archives)
+SEASON_MONTHS = MONTHS + ['may','june','july','august','september']
+
+# Add headers to mimic a browser request
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# basketball-reference tags every schedule cell with a data-stat attribute.
+# Older seasons lack some columns (no start times or game lengths), so cells
+# are matched up by these rather than by position where possible.
+DATA_STATS = {
+    'date_game': 'Date',
+    'game_start_time': 'Start (ET)',
+    'visitor_team_name': 'Visitor/Neutral',
+    'visitor_pts': 'away_pts',
+    'home_team_name': 'Home/Neutral',
+    'home_pts': 'home_pts',
+    'box_score_text': 'Box Score',
+    'overtimes': 'OT',
+    'attendance': 'Attend.',
+    'game_duration': 'LOG',
+    'arena_name': 'Arena',
+    'game_remarks': 'Notes'
+}
+
+def fetch_page(url, archive=True, retries=4, backoff=3):
+    # Make the request with a slight delay to be respectful to the server.
+    # Failed requests are retried, waiting twice as long each time.
+    for attempt in range(retries + 1):
+        time.sleep(3 if attempt == 0 else backoff * 2 ** attempt)
+        try:
+            response = requests.get(url, headers=HEADERS, timeout=30)
+            response.raise_for_status()  # Raise an exception for bad status codes
+            break
+        except requests.RequestException as e:
+            if attempt == retries:
+                raise
+            print(f"Error fetching {url} ({e}), retrying")
+    if archive:
+        store_page(url, response.text)
+    return response.text
+
+def parse_schedule_page(html):
+    # Yields one list of cell values per game row of the schedule table
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Find the schedule table
+    table = soup.find('table', id='schedule')
+
+    if table is None:
+        raise ValueError("Schedule table not found on the page")
+
+    for row in table.find_all('tr')[1:]:  # Skip header row
+        cells = row.find_all(['td', 'th'])
+        stats = [cell.get('data-stat') for cell in cells]
+        if 'date_game' in stats:
+            values = {DATA_STATS[stat]: cell.text.strip() for stat, cell in zip(stats, cells) if stat in DATA_STATS}
+            yield [values.get(column, '') for column in SCHEDULE_COLUMNS]
+        elif len(cells) == len(SCHEDULE_COLUMNS):
+            yield [cell.text.strip() for cell in cells]
+
+def month_order(url):
+    # e.g. NBA_2020_games-october-2020.html sorts after NBA_2020_games-september.html
+    match = re.search(r'_games-([a-z]+)(-\d+)?\.html$', url)
+    if match is None or match.group(1) not in SEASON_MONTHS:
+        return (len(SEASON_MONTHS), url)
+    return (SEASON_MONTHS.index(match.group(1)) + (len(SEASON_MONTHS) if match.group(2) else 0), url)
+
+def archived_month_urls(season, root=FIXTURE_DIR):
+    prefix = f"https://www.basketball-reference.com/leagues/NBA_{season}_games-"
+    return sorted((url for url in load_index(root) if url.startswith(prefix)), key=month_order)
+
+def _parse_archived(args):
+    # Runs in a worker process, so it returns a list rather than a generator
+    digest, root = args
+    return list(parse_schedule_page(load_object(digest, root)))
+
+def replay_schedule(urls, root=FIXTURE_DIR, workers=None):
+    # Rebuilds a season's rows entirely from the fixture archive, parsing
+    # the pages in parallel. urls are the league's source pages for the
+    # season (see leagues.py); rows come back in the same order. Every one
+    # of them has to be archived, or the season would come back short.
+    index = load_index(root)
+    missing = [url for url in urls if url not in index]
+    if missing:
+        raise FileNotFoundError(f"{len(missing)} of the season's {len(urls)} pages aren't archived in {root}: " + ', '.join(missing))
+    jobs = [(index[url]['sha256'], root) for url in urls]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for rows in executor.map(_parse_archived, jobs):
+            yield from rows
@@ -0,0 +1,116 @@
+CONFERENCES = {
+    'Eastern': [
+        'Atlanta Hawks', 'Boston Celtics', 'Brooklyn Nets', 'Charlotte Hornets',
+        'Chicago Bulls', 'Cleveland Cavaliers', 'Detroit Pistons', 'Indiana Pacers',
+        'Miami Heat', 'Milwaukee Bucks', 'New York Knicks', 'Orlando Magic',
+        'Philadelphia 76ers', 'Toronto Raptors', 'Washington Wizards'
+    ],
+    'Western': [
+        'Dallas Mavericks', 'Denver Nuggets', 'Golden State Warriors', 'Houston Rockets',
+        'Los Angeles Clippers', 'Los Angeles Lakers', 'Memphis Grizzlies', 
+        'Minnesota Timberwolves', 'New Orleans Pelicans', 'Oklahoma City Thunder',
+        'Phoenix Suns', 'Portland Trail Blazers', 'Sacramento Kings', 
+        'San Antonio Spurs', 'Utah Jazz'
+    ]
+}
+
+TEAM_COLORS = {
+    'Los Angeles Lakers': 'rgb(85,37,130)',
+    'Phoenix Suns': 'rgb(29,17,96)',
+    'Houston Rockets': 'rgb(206,17,65)',
+    'Boston Celtics': 'rgb(0,122,51)',
+    'Washington Wizards': 'rgb(0,43,92)',
+    'Atlanta Hawks': 'rgb(200,16,46)',
+    'Detroit Pistons': 'rgb(200,16,46)',
+    'Minnesota Timberwolves': 'rgb(12,35,64)',
+    'Cleveland Cavaliers': 'rgb(134,0,56)',
+    'New Orleans Pelicans': 'rgb(0,22,65)',
+    'Oklahoma City Thunder': 'rgb(0,125,195)',
+    'Sacramento Kings': 'rgb(91,43,130)',
+    'Dallas Mavericks': 'rgb(0,83,188)',
+    'Portland Trail Blazers': 'rgb(224,58,62)',
+    'Philadelphia 76ers': 'rgb(0,107,182)',
+    'Denver Nuggets': 'rgb(13,34,64)',
+    'New York Knicks': 'rgb(0,107,182)',
+    'Miami Heat': 'rgb(152,0,46)',
+    'Toronto Raptors': 'rgb(206,17,65)',
+    'Brooklyn Nets': 'rgb(0,0,0)',
+    'Los Angeles Clippers': 'rgb(200,16,46)',
+    'Orlando Magic': 'rgb(0,125,197)',
+    'Golden State Warriors': 'rgb(255,199,44)',
+    'Chicago Bulls': 'rgb(206,17,65)',
+    'Memphis Grizzlies': 'rgb(93,118,169)',
+    'Indiana Pacers': 'rgb(0,45,98)',
+    'Utah Jazz': 'rgb(0,43,92)',
+    'San Antonio Spurs': 'rgb(196,206,211)',
+    'Milwaukee Bucks': 'rgb(0,71,27)',
+    'Charlotte Hornets': 'rgb(0,120,140)'
+}
+
+TEAM_ABBRS = {
+    'Los Angeles Lakers': 'LAL',
+    'Phoenix Suns': 'PHX',
+    'Houston Rockets': 'HOU',
+    'Boston Celtics': 'BOS',
+    'Washington Wizards': 'WAS',
+    'Atlanta Hawks': 'ATL',
+    'Detroit Pistons': 'DET',
+    'Minnesota Timberwolves': 'MIN',
+    'Cleveland Cavaliers': 'CLE',
+    'New Orleans Pelicans': 'NOP',
+    'Oklahoma City Thunder': 'OKC',
+    'Sacramento Kings': 'SAC',
+    'Dallas Mavericks': 'DAL',
+    'Portland Trail Blazers': 'POR',
+    'Philadelphia 76ers': 'PHI',
+    'Denver Nuggets': 'DEN',
+    'New York Knicks': 'NYK',
+    'Miami Heat': 'MIA',
+    'Toronto Raptors': 'TOR',
+    'Brooklyn Nets': 'BKN',
+    'Los Angeles Clippers': 'LAC',
+    'Orlando Magic': 'ORL',
+    'Golden State Warriors': 'GSW',
+    'Chicago Bulls': 'CHI',
+    'Memphis Grizzlies': 'MEM',
+    'Indiana Pacers': 'IND',
+    'Utah Jazz': 'UTA',
+    'San Antonio Spurs': 'SAS',
+    'Milwaukee Bucks': 'MIL',
+    'Charlotte Hornets': 'CHA'
+}
+
+# Former names of current franchises, as they appear on basketball-reference,
+# keyed by the name and the first and last season (named by the year it ends
+# in) it was used. Ratings follow the team rather than the name: the
+# 1989-2002 Charlotte Hornets moved to New Orleans, while today's Charlotte
+# Hornets began as the 2005 Bobcats expansion team.
+TEAM_ALIASES = {
+    ('Seattle SuperSonics', 1968, 2008): 'Oklahoma City Thunder',
+    ('New Jersey Nets', 1978, 2012): 'Brooklyn Nets',
+    ('New York Nets', 1977, 1977): 'Brooklyn Nets',
+    ('Charlotte Hornets', 1989, 2002): 'New Orleans Pelicans',
+    ('Charlotte Bobcats', 2005, 2014): 'Charlotte Hornets',
+    ('New Orleans Hornets', 2003, 2013): 'New Orleans Pelicans',
+    ('New Orleans/Oklahoma City Hornets', 2006, 2007): 'New Orleans Pelicans',
+    ('Vancouver Grizzlies', 1996, 2001): 'Memphis Grizzlies',
+    ('Washington Bullets', 1975, 1997): 'Washington Wizards',
+    ('Capital Bullets', 1974, 1974): 'Washington Wizards',
+    ('Baltimore Bullets', 1964, 1973): 'Washington Wizards',
+    ('Kansas City Kings', 1976, 1985): 'Sacramento Kings',
+    ('Kansas City-Omaha Kings', 1973, 1975): 'Sacramento Kings',
+    ('San Diego Clippers', 1979, 1984): 'Los Angeles Clippers',
+    ('Buffalo Braves', 1971, 1978): 'Los Angeles Clippers',
+    ('New Orleans Jazz', 1975, 1979): 'Utah Jazz'
+}
+
+_ALIASES_BY_NAME = {}
+for (name, first, last), franchise in TEAM_ALIASES.items():
+    _ALIASES_BY_NAME.setdefault(name, []).append((first, last, franchise))
+
+def canonical_team(name, season):
+    # Today's name for the franchise that played as `name` in `season`
+    for first, last, franchise in _ALIASES_BY_NAME.get(name, ()):
+        if first <= season <= last:
+            return franchise
+    return name
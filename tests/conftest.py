@@ -0,0 +1,18 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+@pytest.fixture
+def updater(tmp_path, monkeypatch):
+    # schedule-updater.py isn't importable by name, so it's loaded from its path,
+    # with checkpoints kept in a fresh directory for every test
+    spec = importlib.util.spec_from_file_location('schedule_updater', os.path.join(ROOT, 'schedule-updater.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, 'CHECKPOINT_DIR', str(tmp_path / 'checkpoints'))
+    return module
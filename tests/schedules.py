@@ -0,0 +1,28 @@
+import random
+from datetime import date, timedelta
+
+from pipeline import Game, SCHEDULE_COLUMNS
+
+# Synthetic schedules for the tests, so they need no network or fixture archive
+
+def synthetic_games(teams, games=1230, seed=0, start=date(2024, 10, 22)):
+    # Rounds in which every team plays once, one round per day, with no ties.
+    # With 30 teams and 1230 games every team plays 82.
+    rng = random.Random(seed)
+    per_round = len(teams) // 2
+    result = []
+    for r in range(-(-games // per_round)):
+        day = (start + timedelta(days=r)).strftime('%a, %b %d, %Y')
+        order = rng.sample(teams, len(teams))
+        for j in range(min(per_round, games - len(result))):
+            away_pts = home_pts = 0
+            while away_pts == home_pts:
+                away_pts, home_pts = rng.randint(85, 130), rng.randint(85, 130)
+            result.append(Game(day, order[2 * j], away_pts, order[2 * j + 1], home_pts))
+    return result
+
+def to_row(game):
+    # A scraped row (SCHEDULE_COLUMNS order) for a game
+    values = {'Date': game.date, 'Visitor/Neutral': game.away, 'away_pts': str(game.away_pts),
+              'Home/Neutral': game.home, 'home_pts': str(game.home_pts)}
+    return [values.get(column, '') for column in SCHEDULE_COLUMNS]
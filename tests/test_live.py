@@ -0,0 +1,23 @@
+import pytest
+
+from live import GAME_SECONDS, live_win_probability
+
+@pytest.mark.parametrize('margin, expected', [(1, 1.0), (-1, 0.0), (0, 0.5)])
+def test_final_score_decides(margin, expected):
+    assert live_win_probability(0.7, margin, 0) == expected
+
+def test_tip_off_is_the_pregame_probability():
+    assert live_win_probability(0.7, 0, GAME_SECONDS) == pytest.approx(0.7)
+
+def test_tied_game_between_even_teams_is_a_coin_flip():
+    for seconds in (GAME_SECONDS, GAME_SECONDS / 2, 1):
+        assert live_win_probability(0.5, 0, seconds) == pytest.approx(0.5)
+
+def test_lead_matters_more_as_time_runs_out():
+    early = live_win_probability(0.5, 5, GAME_SECONDS - 60)
+    late = live_win_probability(0.5, 5, 60)
+    assert 0.5 < early < late < 1.0
+
+def test_certain_pregame_probabilities_stay_finite():
+    assert 0.0 < live_win_probability(0.0, 0, GAME_SECONDS / 2) < 0.5
+    assert 0.5 < live_win_probability(1.0, 0, GAME_SECONDS / 2) < 1.0
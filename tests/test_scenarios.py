@@ -0,0 +1,39 @@
+import pytest
+
+from elo import rate_games
+from pipeline import Game
+from scenarios import SeasonReplay
+from schedules import synthetic_games
+from teams import TEAM_ABBRS
+
+TEAMS = list(TEAM_ABBRS)
+
+def full_replay(games, overrides):
+    # Rates the season from scratch with the overridden results swapped round
+    flipped = []
+    for i, game in enumerate(games):
+        if i in overrides and overrides[i] != (game.home_pts > game.away_pts):
+            game = Game(game.date, game.away, game.home_pts, game.home, game.away_pts)
+        flipped.append(game)
+    current_elos = {team: 1500.0 for team in TEAMS}
+    histories = {team: [1500.0] for team in TEAMS}
+    for rated in rate_games(flipped, current_elos):
+        histories[rated.game.home].append(rated.home_after)
+        histories[rated.game.away].append(rated.away_after)
+    return current_elos, histories
+
+@pytest.mark.parametrize('overrides', [
+    {},
+    {0: False, 1: True},
+    {137: True, 138: False, 600: True},
+    {1229: False}
+])
+def test_scenario_matches_full_replay(overrides):
+    games = synthetic_games(TEAMS, seed=3)
+    base = SeasonReplay(games, {team: 1500.0 for team in TEAMS})
+    scenario = base.scenario(overrides)
+
+    final, histories = full_replay(games, overrides)
+    assert scenario.final_elos() == pytest.approx(final)
+    for team, history in scenario.histories().items():
+        assert history == pytest.approx(histories[team])
@@ -0,0 +1,108 @@
+import time
+
+import pytest
+
+from leagues import LEAGUES
+from pipeline import SCHEDULE_COLUMNS
+from schedules import synthetic_games, to_row
+from validation import validate_schedule
+
+NBA = LEAGUES['NBA']
+URLS = ['https://example.com/october.html', 'https://example.com/november.html', 'https://example.com/december.html']
+
+def season_rows():
+    return [to_row(game) for game in synthetic_games(NBA['teams'])]
+
+def test_full_season_validates():
+    assert validate_schedule(season_rows(), NBA, 2025) == []
+
+def test_missing_month_is_reported():
+    rows = season_rows()
+    problems = validate_schedule(rows[:100] + rows[200:], NBA, 2025)
+    assert problems
+    assert all('fewer than the 82' in problem for problem in problems)
+
+def test_unfinished_season_can_be_short():
+    # Before the NBA Cup group stage is over every team is listed with 80 games
+    away_pts, home_pts = SCHEDULE_COLUMNS.index('away_pts'), SCHEDULE_COLUMNS.index('home_pts')
+    rows = season_rows()[:1200]
+    for row in rows[600:]:
+        row[away_pts] = row[home_pts] = ''
+    assert validate_schedule(rows, NBA, 2025) == []
+
+def test_former_names_and_short_seasons():
+    names = {'Charlotte Hornets': 'Charlotte Bobcats', 'Oklahoma City Thunder': 'Seattle SuperSonics'}
+    rows = [[names.get(value, value) for value in row] for row in season_rows()]
+    assert validate_schedule(rows, NBA, 2008) == []
+    assert validate_schedule(rows, NBA, 2025) != []
+    assert validate_schedule(season_rows()[:990], NBA, 2012) == []
+
+class FakeSite:
+    # Serves one page per URL, optionally failing on some of them
+    def __init__(self, pages, failing=()):
+        self.pages = pages
+        self.failing = set(failing)
+        self.fetched = []
+
+    def fetch_page(self, url):
+        self.fetched.append(url)
+        if url in self.failing:
+            raise ConnectionError(f"{url} is down")
+        return url
+
+    def parse_schedule_page(self, url):
+        return iter(self.pages[url])
+
+@pytest.fixture
+def site(updater, monkeypatch):
+    rows = season_rows()
+    site = FakeSite({url: rows[i * 10:(i + 1) * 10] for i, url in enumerate(URLS)})
+    monkeypatch.setattr(updater, 'fetch_page', site.fetch_page)
+    monkeypatch.setattr(updater, 'parse_schedule_page', site.parse_schedule_page)
+    return site
+
+def test_resumes_after_failed_page(updater, site):
+    site.failing = {URLS[1]}
+    with pytest.raises(updater.UpdateError):
+        updater.fetch_season(URLS, 'NBA', 2025)
+    assert site.fetched == URLS[:2]
+
+    site.failing = set()
+    site.fetched = []
+    rows = updater.fetch_season(URLS, 'NBA', 2025)
+    assert site.fetched == URLS[1:]
+    assert rows == [row for url in URLS for row in site.pages[url]]
+
+def test_last_page_is_always_refetched(updater, site):
+    updater.fetch_season(URLS, 'NBA', 2025)
+    site.fetched = []
+    updater.fetch_season(URLS, 'NBA', 2025)
+    assert site.fetched == URLS[-1:]
+
+def test_empty_page_is_an_error(updater, site):
+    site.pages[URLS[1]] = []
+    with pytest.raises(updater.UpdateError, match='without any games'):
+        updater.fetch_season(URLS, 'NBA', 2025)
+
+def test_lost_games_are_an_error(updater, site):
+    updater.fetch_season(URLS, 'NBA', 2025)
+    site.pages[URLS[-1]] = site.pages[URLS[-1]][:5]
+    with pytest.raises(updater.UpdateError, match='fewer games than last time'):
+        updater.fetch_season(URLS, 'NBA', 2025)
+    # The short page isn't checkpointed, so the next run still catches it
+    with pytest.raises(updater.UpdateError):
+        updater.fetch_season(URLS, 'NBA', 2025)
+
+def test_unfinished_and_stale_pages_are_refetched(updater, site, monkeypatch):
+    away_pts = SCHEDULE_COLUMNS.index('away_pts')
+    site.pages[URLS[1]][-1][away_pts] = ''
+    updater.fetch_season(URLS, 'NBA', 2025)
+    site.fetched = []
+    updater.fetch_season(URLS, 'NBA', 2025)
+    assert site.fetched == URLS[1:]
+
+    later = time.time() + updater.CHECKPOINT_MAX_AGE + 1
+    monkeypatch.setattr(updater.time, 'time', lambda: later)
+    site.fetched = []
+    updater.fetch_season(URLS, 'NBA', 2025)
+    assert site.fetched == URLS
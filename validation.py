@@ -0,0 +1,73 @@
+from collections import Counter
+
+from leagues import season_length
+from pipeline import SCHEDULE_COLUMNS, parse_date
+from teams import canonical_team
+
+def validate_schedule(rows, league, season):
+    # Checks scraped rows (lists in SCHEDULE_COLUMNS order) for `season`
+    # before they're published. Returns a list of problems; an empty list
+    # means the rows are good. Former team names are checked as the
+    # franchise they belong to that season.
+    problems = []
+    schema = league['schedule_schema']
+    teams = set(league['teams']) if league['teams'] is not None else None
+    column = {field: SCHEDULE_COLUMNS.index(name) for field, name in schema.items()}
+
+    if not rows:
+        return ["No games in the schedule"]
+
+    seen = set()
+    scheduled = Counter()
+    last_day = None
+    for n, row in enumerate(rows, start=1):
+        if len(row) != len(SCHEDULE_COLUMNS):
+            problems.append(f"Row {n}: expected {len(SCHEDULE_COLUMNS)} columns, got {len(row)}")
+            continue
+
+        date, away, home = row[column['date']], row[column['away']], row[column['home']]
+        away_pts, home_pts = row[column['away_pts']], row[column['home_pts']]
+
+        try:
+            day = parse_date(date)
+        except ValueError:
+            problems.append(f"Row {n}: unreadable date {date!r}")
+            continue
+        if last_day is not None and day < last_day:
+            problems.append(f"Row {n}: {date} comes after a later date")
+        last_day = day
+
+        for team in (away, home):
+            if teams is not None and canonical_team(team, season) not in teams:
+                problems.append(f"Row {n}: unknown team {team!r}")
+        if away == home:
+            problems.append(f"Row {n}: {home} playing itself")
+
+        if bool(away_pts) != bool(home_pts):
+            problems.append(f"Row {n}: only one team has a score")
+        elif away_pts:
+            if not (away_pts.isdigit() and home_pts.isdigit()):
+                problems.append(f"Row {n}: non-numeric score {away_pts!r}-{home_pts!r}")
+            elif away_pts == home_pts:
+                problems.append(f"Row {n}: tied score {away_pts}-{home_pts}")
+
+        key = (day, away, home)
+        if key in seen:
+            problems.append(f"Row {n}: duplicate game {away} @ {home} on {date}")
+        seen.add(key)
+        scheduled[away] += 1
+        scheduled[home] += 1
+
+    for team, count in scheduled.items():
+        if count > league['max_games']:
+            problems.append(f"{team} has {count} games, more than the {league['max_games']} possible")
+
+    # Only a finished season is known to be complete: until then the NBA lists
+    # 80 games per team, two short, until the NBA Cup group stage is over
+    if all(len(row) == len(SCHEDULE_COLUMNS) and row[column['away_pts']] for row in rows):
+        games = season_length(league, season)
+        for team, count in sorted(scheduled.items()):
+            if count < games:
+                problems.append(f"{team} has {count} games, fewer than the {games} in the {season} season")
+
+    return problems